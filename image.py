@@ -29,7 +29,18 @@ class Noise:
         return img
 
     @staticmethod
-    def gaussian(img: numpy.array, mean: float = 0, var: float = 0.001):
+    def gaussian(img: numpy.array, mean: float = 0, var: float = 0.001, dtype=None):
+        """
+        :param dtype: 计算使用的浮点类型，None时与原实现一致（负值转换为uint8时回绕）；
+                      指定时在该精度下原地计算并饱和到[0, 255]，float32的舍入误差约为255 * 6e-8
+        """
+        if dtype is not None:
+            img = img.astype(dtype)
+            noise = numpy.random.normal(mean, var ** 0.5, img.shape).astype(dtype)
+            noise *= 255
+            img += noise
+            numpy.clip(img, 0, 255, out=img)
+            return img.astype(numpy.uint8)
         img = numpy.copy(img)
         img = numpy.array(img, dtype=float) / 255
         noise = numpy.random.normal(mean, var ** 0.5, img.shape)
@@ -40,17 +51,25 @@ class Noise:
 
 
 class Filter:
+    def __init__(self, dtype=float):
+        """
+        :param dtype: 均值、高斯滤波的计算类型；numpy.uint8时以原图类型填充，窗口求和仍以float64累加，结果与float完全一致；
+                      numpy.float32时窗口求和误差约为kernel_size ** 2 * 255 * 6e-8，
+                      结果恰为整数的像素可能因截断小1；中值滤波只做比较，始终使用原图类型
+        """
+        self.dtype = dtype
+
     @staticmethod
-    def pad(img: numpy.array, kernel_size: int = 3):
+    def pad(img: numpy.array, kernel_size: int = 3, dtype=float):
         assert kernel_size & 1
         padding = kernel_size // 2
         rows, cols, chn = img.shape
-        padded = numpy.zeros((rows + padding * 2, cols + padding * 2, chn), dtype=float)
+        padded = numpy.zeros((rows + padding * 2, cols + padding * 2, chn), dtype=dtype)
         padded[padding:padding + rows, padding:padding + cols, :] = numpy.copy(img)
         return rows, cols, chn, padding, padded
 
     def gaussian(self, img: numpy.array, kernel_size: int = 3, var: float = 1.3):
-        rows, cols, chn, padding, padded = self.pad(img, kernel_size)
+        rows, cols, chn, padding, padded = self.pad(img, kernel_size, self.dtype)
 
         kernel = numpy.zeros((kernel_size, kernel_size))
         for x in range(-padding, -padding + kernel_size):
@@ -58,6 +77,8 @@ class Filter:
                 kernel[x + padding, y + padding] = numpy.exp(-(x ** 2 + y ** 2) / (2 * (var ** 2)))
         kernel /= var * numpy.sqrt(2 * numpy.pi)
         kernel /= kernel.sum()
+        if numpy.dtype(self.dtype).kind == 'f':
+            kernel = kernel.astype(self.dtype)
 
         out = numpy.copy(padded)
 
@@ -71,7 +92,7 @@ class Filter:
         return numpy.uint8(out[padding:padding + rows, padding:padding + cols, :])
 
     def median(self, img: numpy.array, kernel_size: int = 3):
-        rows, cols, chn, padding, padded = self.pad(img, kernel_size)
+        rows, cols, chn, padding, padded = self.pad(img, kernel_size, img.dtype)
 
         out = numpy.copy(padded)
 
@@ -84,7 +105,7 @@ class Filter:
         return numpy.uint8(out[padding:padding + rows, padding:padding + cols, :])
 
     def mean(self, img: numpy.array, kernel_size: int = 3):
-        rows, cols, chn, padding, padded = self.pad(img, kernel_size)
+        rows, cols, chn, padding, padded = self.pad(img, kernel_size, self.dtype)
 
         out = numpy.copy(padded)
 
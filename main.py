@@ -3,7 +3,7 @@ import numpy
 import pywt
 from PIL import Image
 from image import Noise, Filter, Mask
-from skimage.metrics import peak_signal_noise_ratio
+from metrics import Quality
 
 
 def noise():
@@ -59,17 +59,18 @@ def noise():
 
 def psnr():
     img = numpy.array(Image.open(image))
-    ans = {}
+    names = []
     for i in range(1, 4):
-        name = os.path.join(save_dir, f'{i}.png')
-        ans[name] = peak_signal_noise_ratio(img, numpy.array(Image.open(name)))
+        names.append(os.path.join(save_dir, f'{i}.png'))
         for j in range(1, 4):
             for k in range(1, 5):
                 name = os.path.join(save_dir, f'{i}_{j}_{k}.png')
                 if os.path.exists(name):
-                    ans[name] = peak_signal_noise_ratio(img, numpy.array(Image.open(name)))
-    for k, v in ans.items():
-        print(k.split('/')[-1], v)
+                    names.append(name)
+    # 参考图像统计量只计算一次，候选图像堆叠后批量计算
+    ans = Quality(img).score([numpy.array(Image.open(name)) for name in names], ssim=False)
+    for name, v in zip(names, ans['psnr_all']):
+        print(name.split('/')[-1], v)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,164 @@
+import numpy
+
+
+def box(img: numpy.array, size: int):
+    # 积分图计算size * size窗口均值，只保留完整窗口，img形状为(..., 行, 列, 通道)
+    integral = numpy.zeros(img.shape[:-3] + (img.shape[-3] + 1, img.shape[-2] + 1, img.shape[-1]))
+    integral[..., 1:, 1:, :] = img.cumsum(axis=-3).cumsum(axis=-2)
+    total = integral[..., size:, size:, :] - integral[..., :-size, size:, :] \
+        - integral[..., size:, :-size, :] + integral[..., :-size, :-size, :]
+    return total / (size * size)
+
+
+class Quality:
+    """
+    参考图像固定时批量计算候选图像的MSE、PSNR、SSIM，参考图像的统计量只计算一次
+    SSIM与skimage.metrics.structural_similarity的默认参数一致：7 * 7均匀窗口，K1 = 0.01，K2 = 0.03，样本协方差
+    """
+
+    def __init__(self, reference: numpy.array, data_range: float = 255, win_size: int = 7,
+                 k1: float = 0.01, k2: float = 0.03, block: int = 8):
+        """
+        :param reference: 参考图像，形状为(行, 列, 通道)或(行, 列)
+        :param data_range: 像素取值范围
+        :param win_size: SSIM窗口大小，奇数
+        :param block: 每次同时计算的候选图像数，限制内存占用
+        """
+        assert win_size & 1
+        # 灰度图像内部增加通道维，候选图像的形状按原始维数判断
+        self.gray = numpy.ndim(reference) == 2
+        self.reference = self.__shape__(numpy.asarray(reference, dtype=float))
+        self.data_range = data_range
+        self.win_size = win_size
+        self.block = block
+        self.c1 = (k1 * data_range) ** 2
+        self.c2 = (k2 * data_range) ** 2
+        count = win_size * win_size
+        self.cov_norm = count / (count - 1)
+        self.ssim_valid = min(self.reference.shape[:2]) >= win_size
+        if self.ssim_valid:
+            self.ux = box(self.reference, win_size)
+            self.vx = self.cov_norm * (box(self.reference * self.reference, win_size) - self.ux * self.ux)
+
+    @staticmethod
+    def __shape__(img: numpy.array):
+        return img[..., None] if img.ndim == 2 else img
+
+    def sse(self, candidates: numpy.array):
+        # 每个候选图像每个通道的误差平方和，形状为(候选数, 通道)
+        diff = candidates - self.reference
+        return numpy.einsum('khwc,khwc->kc', diff, diff)
+
+    def ssim_sum(self, candidates: numpy.array):
+        # 每个候选图像每个通道所有完整窗口的SSIM之和，形状为(候选数, 通道)
+        uy = box(candidates, self.win_size)
+        vy = self.cov_norm * (box(candidates * candidates, self.win_size) - uy * uy)
+        vxy = self.cov_norm * (box(candidates * self.reference, self.win_size) - self.ux * uy)
+        s = ((2 * self.ux * uy + self.c1) * (2 * vxy + self.c2)) / \
+            ((self.ux * self.ux + uy * uy + self.c1) * (self.vx + vy + self.c2))
+        return s.sum(axis=(1, 2))
+
+    def __stack__(self, candidates) -> numpy.array:
+        candidates = stack(candidates, self.gray)
+        assert candidates.shape[1:] == self.reference.shape
+        return candidates
+
+    def score(self, candidates, ssim: bool = True) -> dict:
+        """
+        :param candidates: 单个候选图像，形状为(候选数, 行, 列, 通道)的数组或图像列表；参考图像为灰度图像时没有通道维
+        :param ssim: 是否计算SSIM
+        :return: {'mse', 'psnr', 'ssim'}为每个通道的结果，形状为(候选数, 通道)；带'_all'后缀的为整体结果，形状为(候选数,)
+        """
+        candidates = self.__stack__(candidates)
+        sse = numpy.zeros((len(candidates), self.reference.shape[-1]))
+        ssim_sum = numpy.zeros_like(sse)
+        for i in range(0, len(candidates), self.block):
+            part = candidates[i:i + self.block].astype(float)
+            sse[i:i + self.block] = self.sse(part)
+            if ssim and self.ssim_valid:
+                ssim_sum[i:i + self.block] = self.ssim_sum(part)
+        rows, cols = self.reference.shape[:2]
+        windows = (rows - self.win_size + 1) * (cols - self.win_size + 1) if ssim and self.ssim_valid else 0
+        return result(sse, rows * cols, ssim_sum if windows else None, windows, self.data_range)
+
+
+def stack(candidates, gray: bool) -> numpy.array:
+    """
+    将候选图像整理为(候选数, 行, 列, 通道)的数组
+    :param candidates: 单个候选图像、候选图像数组或图像列表
+    :param gray: 参考图像是否为没有通道维的灰度图像
+    """
+    if isinstance(candidates, (list, tuple)):
+        candidates = numpy.stack([numpy.asarray(c) for c in candidates])
+    candidates = numpy.asarray(candidates)
+    if candidates.ndim == (2 if gray else 3):
+        candidates = candidates[None]
+    return candidates[..., None] if gray else candidates
+
+
+def psnr(mse: numpy.array, data_range: float):
+    with numpy.errstate(divide='ignore'):
+        return 10 * numpy.log10(data_range ** 2 / mse)
+
+
+def result(sse: numpy.array, pixels: int, ssim_sum: numpy.array or None, windows: int, data_range: float) -> dict:
+    mse = sse / pixels
+    ret = {'mse': mse, 'mse_all': mse.mean(axis=1), 'psnr': psnr(mse, data_range),
+           'psnr_all': psnr(mse.mean(axis=1), data_range)}
+    if ssim_sum is not None:
+        ret['ssim'] = ssim_sum / windows
+        ret['ssim_all'] = ret['ssim'].mean(axis=1)
+    return ret
+
+
+class QualityStream:
+    """
+    按行分块流式计算，适用于无法一次性读入内存的大图像
+    每次传入参考图像与候选图像接下来的若干行，内部保留上一块末尾win_size - 1行，跨块的SSIM窗口同样只计算一次
+    """
+
+    def __init__(self, data_range: float = 255, win_size: int = 7, k1: float = 0.01, k2: float = 0.03,
+                 ssim: bool = True):
+        assert win_size & 1
+        self.data_range = data_range
+        self.win_size = win_size
+        self.k1 = k1
+        self.k2 = k2
+        self.ssim = ssim
+        self.sse = None
+        self.ssim_sum = None
+        self.pixels = 0
+        self.windows = 0
+        self.reference_tail = None
+        self.candidates_tail = None
+
+    def update(self, reference_rows: numpy.array, candidates_rows: numpy.array):
+        """
+        :param reference_rows: 参考图像接下来的若干行，形状为(行, 列, 通道)，灰度图像为(行, 列)
+        :param candidates_rows: 候选图像对应的行，形状为(候选数, 行, 列, 通道)，单个候选图像时没有候选数维
+        """
+        gray = numpy.ndim(reference_rows) == 2
+        reference_rows = Quality.__shape__(numpy.asarray(reference_rows, dtype=float))
+        candidates_rows = stack(candidates_rows, gray).astype(float)
+        assert candidates_rows.shape[1:] == reference_rows.shape
+        diff = candidates_rows - reference_rows
+        sse = numpy.einsum('khwc,khwc->kc', diff, diff)
+        self.sse = sse if self.sse is None else self.sse + sse
+        self.pixels += reference_rows.shape[0] * reference_rows.shape[1]
+        if not self.ssim:
+            return
+        if self.reference_tail is not None:
+            reference_rows = numpy.concatenate((self.reference_tail, reference_rows), axis=0)
+            candidates_rows = numpy.concatenate((self.candidates_tail, candidates_rows), axis=1)
+        keep = self.win_size - 1
+        if reference_rows.shape[0] >= self.win_size and reference_rows.shape[1] >= self.win_size:
+            quality = Quality(reference_rows, self.data_range, self.win_size, self.k1, self.k2)
+            ssim_sum = quality.ssim_sum(candidates_rows)
+            self.ssim_sum = ssim_sum if self.ssim_sum is None else self.ssim_sum + ssim_sum
+            self.windows += quality.ux.shape[0] * quality.ux.shape[1]
+        self.reference_tail = reference_rows[max(0, reference_rows.shape[0] - keep):]
+        self.candidates_tail = candidates_rows[:, max(0, candidates_rows.shape[1] - keep):]
+
+    def result(self) -> dict:
+        assert self.sse is not None
+        return result(self.sse, self.pixels, self.ssim_sum if self.windows else None, self.windows, self.data_range)
@@ -2,11 +2,49 @@ import abc
 import math
 import os
 
-from matplotlib import pyplot
-from matplotlib.pyplot import MultipleLocator
-
-pyplot.rcParams['font.sans-serif'] = ['SimHei']
-pyplot.rcParams['axes.unicode_minus'] = False
+import numpy
+
+from .cache import Cache
+
+
+def __params__(signal1, signal2, multi_type: str) -> dict:
+    """
+    两个信号运算结果的时间范围、采样率与信号类型
+    :param signal1: 左操作数
+    :param signal2: 右操作数
+    :param multi_type: 运算类型
+    :return: 基类参数
+    """
+    signal_type = int
+    if signal1.signal_type is int and signal2.signal_type is int:
+        assert signal1.delta == signal2.delta
+        rate = signal1.rate
+    elif signal1.signal_type is int:
+        rate = signal1.rate
+    else:
+        if signal2.signal_type is float:
+            signal_type = float
+        rate = signal2.rate
+    end = len(signal1) + len(signal2) - 2 if multi_type == "**" else max(signal1.end, signal2.end)
+    return dict(start=min(signal1.start, signal2.start), end=end, rate=rate, signal_type=signal_type,
+                thread_safe=signal1.thread_safe or signal2.thread_safe, dtype=__dtype__(signal1, signal2))
+
+
+def __dtype__(signal1, signal2):
+    # 任一操作数为默认精度时结果为默认精度，否则取两者中较高的精度
+    if signal1.dtype is None or signal2.dtype is None:
+        return None
+    return numpy.promote_types(signal1.dtype, signal2.dtype)
+
+
+def __wide__(values: numpy.ndarray) -> numpy.ndarray:
+    """
+    求和前提升到float64/complex128，float32下长序列求和的相对误差由O(n * 1e-7)降为O(n * 1e-16)
+    :param values: 数组
+    :return: 提升精度后的数组，已是高精度时不复制
+    """
+    values = numpy.asarray(values)
+    return values.astype(numpy.promote_types(values.dtype, numpy.float64), copy=False)
 
 
 class Drawable(metaclass=abc.ABCMeta):
@@ -19,7 +57,8 @@ class Signal(Drawable, metaclass=abc.ABCMeta):
 
     def __init__(self, start: float or int = 0, end: float or int = 0, rate: float or int = 1,
                  signal_type=int, cycle: bool = False, zero_hold: bool = False, deviation: float = 1e-10,
-                 cache: bool = True, save: bool = False, save_dir: str = './'):
+                 cache: bool = True, thread_safe: bool = False, dtype=None, save: bool = False,
+                 save_dir: str = './'):
         """
         :param start: 开始时间
         :param end: 结束时间
@@ -28,6 +67,9 @@ class Signal(Drawable, metaclass=abc.ABCMeta):
         :param zero_hold: 0阶保持器
         :param deviation: 浮点数计算误差
         :param cache: 是否缓存结果
+        :param thread_safe: 缓存是否线程安全，多个线程共享同一个信号时使用
+        :param dtype: 批量取值(evaluate、solve_array)结果的浮点类型，None为float64，复数信号为对应的复数类型，
+                      如numpy.float32对应complex64；卷积、傅立叶变换等求和仍以float64累加，float32结果的相对误差约为6e-8
         """
         self.zero_hold = zero_hold
         self.deviation = deviation
@@ -44,8 +86,12 @@ class Signal(Drawable, metaclass=abc.ABCMeta):
         self.start = start
         self.end = end
         self.cache = cache
-        self.cache_list = []
-        self.var_list = []
+        self.thread_safe = thread_safe
+        assert dtype is None or numpy.dtype(dtype).kind == 'f'
+        self.dtype = None if dtype is None else numpy.dtype(dtype)
+        self.cache_map = Cache(thread_safe)
+        # 只计算一次的中间结果
+        self.memo = Cache(thread_safe)
 
         self.save = save
         if self.save:
@@ -59,7 +105,7 @@ class Signal(Drawable, metaclass=abc.ABCMeta):
         raise NotImplementedError
 
     def __getitem__(self, var: float or int):
-        if self.cycle:
+        if self.cycle and self.signal_type is float:
             var = (var - self.start) % (self.end - self.start + self.delta) + self.start
 
         if self.signal_type is int:
@@ -68,16 +114,14 @@ class Signal(Drawable, metaclass=abc.ABCMeta):
             if self.zero_hold or math.isclose(var, self.start + self.delta * mul,
                                               abs_tol=self.deviation):
                 # 使用0阶保持器或在浮点数计算误差范围之内
+                if self.cycle:
+                    # 周期信号按采样点序号取模，缓存的时刻始终落在第一个周期内
+                    mul %= len(self)
                 var = self.start + self.delta * mul
             else:
                 return 0
         if self.cache:
-            if var in self.var_list:
-                ret = self.cache_list[self.var_list.index(var)]
-            else:
-                ret = self.__kernel__(var)
-                self.cache_list.append(ret)
-                self.var_list.append(var)
+            ret = self.cache_map.get(var, self.__kernel__, var)
         else:
             ret = self.__kernel__(var)
         return ret
@@ -85,6 +129,117 @@ class Signal(Drawable, metaclass=abc.ABCMeta):
     def get_nth(self, n: int):
         return self[self.start + self.delta * n]
 
+    def __align__(self, var_array: numpy.ndarray) -> (numpy.ndarray, numpy.ndarray):
+        """
+        批量对齐时刻，与__getitem__的范围判断与采样率对齐规则一致
+        :param var_array: 时刻数组
+        :return: (有效时刻掩码，对齐后的时刻）
+        """
+        mask = (var_array >= self.start) & (var_array <= self.end)
+        if self.signal_type is int:
+            mul = numpy.round((var_array - self.start) / self.delta)
+            aligned = self.start + self.delta * mul
+            if not self.zero_hold:
+                mask &= numpy.abs(var_array - aligned) <= self.deviation
+            var_array = aligned
+        return mask, var_array
+
+    def __fill__(self, var_array, func) -> numpy.ndarray:
+        """
+        向量化取值的公共流程：对齐时刻，在有效时刻上调用func，其余时刻为0，并按浮点数计算误差置0
+        :param var_array: 时刻序列
+        :param func: 接受对齐后的有效时刻数组，返回信号状态数组
+        :return: 信号状态数组
+        """
+        var_array = numpy.asarray(var_array, dtype=float)
+        mask, var_array = self.__align__(var_array)
+        values = numpy.asarray(func(var_array[mask]))
+        ret = numpy.zeros(len(var_array), dtype=values.dtype if len(values) else float)
+        ret[mask] = values
+        if numpy.iscomplexobj(ret):
+            ret.real[numpy.abs(ret.real) <= self.deviation] = 0
+            ret.imag[numpy.abs(ret.imag) <= self.deviation] = 0
+        else:
+            ret[numpy.abs(ret) <= self.deviation] = 0
+        return self.__cast__(ret)
+
+    def __cast__(self, values: numpy.ndarray) -> numpy.ndarray:
+        # 按dtype转换批量取值结果，复数结果转换为相同精度的复数类型
+        if self.dtype is None:
+            return values
+        dtype = numpy.promote_types(self.dtype, numpy.complex64) if numpy.iscomplexobj(values) else self.dtype
+        return values.astype(dtype, copy=False)
+
+    def evaluate(self, var_array) -> numpy.ndarray:
+        """
+        批量获取信号状态，子类可覆盖为向量化实现
+        :param var_array: 时刻序列
+        :return: 信号状态数组
+        """
+        return self.__cast__(numpy.array([self[var] for var in numpy.asarray(var_array, dtype=float).tolist()],
+                                         dtype=float))
+
+    def solve_array(self) -> (numpy.ndarray, numpy.ndarray):
+        """
+        一次性计算全部采样点
+        :return: (时刻数组，信号状态数组）
+        """
+        t = self.start + self.delta * numpy.arange(len(self))
+        return t, self.evaluate(t)
+
+    def __view__(self, **kwargs):
+        raise NotImplementedError
+
+    def __slice__(self, item: slice):
+        """
+        切片视图，与Python切片不同，结束时刻包含在内，如a[2:5]包含t = 5时刻，步长为抽取因子
+        非周期信号的切片限制在信号范围内，与信号范围不相交时为全0视图
+        """
+        start = self.start if item.start is None else item.start
+        end = self.end if item.stop is None else item.stop
+        if end < start:
+            raise IndexError("Error slice.")
+        if not self.cycle and start <= self.end and end >= self.start:
+            # 周期信号的切片可以跨越多个周期，非周期信号限制在信号范围内
+            start, end = max(start, self.start), min(end, self.end)
+        # 开始时刻与采样间隔对齐
+        start = self.start + math.ceil((start - self.start) / self.delta - self.deviation) * self.delta
+        if start > end + self.deviation:
+            # 切片范围内没有采样点
+            raise IndexError("Error slice.")
+        ret = self.__view__(start=start, end=max(start, end))
+        return ret if item.step is None else ret.decimate(item.step)
+
+    def shift(self, k: float or int):
+        """
+        时移视图 y(t) = x(t - k)
+        :param k: 延迟时间，负数为超前
+        """
+        return self.__view__(start=self.start + k, end=self.end + k, offset=-k)
+
+    def reverse(self):
+        """
+        反转视图 y(t) = x(-t)
+        """
+        # 以最后一个采样点为开始时刻，结束时刻不在采样点上时反转后的采样点仍与父信号对齐
+        return self.__view__(start=-(self.start + (len(self) - 1) * self.delta), end=-self.start, scale=-1)
+
+    def decimate(self, m: int):
+        """
+        抽取视图，每m个采样点保留一个，时刻不变，采样率变为原来的1/m
+        :param m: 抽取因子
+        """
+        assert type(m) is int and m >= 1
+        end = self.start + (len(self) - 1) // m * m * self.delta
+        return self.__view__(start=self.start, end=end, rate=self.rate / m)
+
+    def window(self, w):
+        """
+        加窗视图 y(t) = x(t) * w(t)
+        :param w: 窗函数，可以是接受numpy数组的函数、信号、或与本信号采样点等长的序列
+        """
+        return self.__view__(start=self.start, end=self.end, window=w)
+
     def __kernel__(self, var: float or int):
         """
         信号实际函数
@@ -94,26 +249,29 @@ class Signal(Drawable, metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
-    def __stem__(self, t: list, x: list, x_label: str, t_label: str = "时间", save_name: str = '1.png'):
-        if self.delta / (self.end - self.start) >= 0.05:
-            pyplot.gca().xaxis.set_major_locator(MultipleLocator(self.delta))
-        pyplot.stem(t, x)
-        pyplot.xlabel(t_label)
-        pyplot.ylabel(x_label)
-        if self.save:
-            pyplot.savefig(os.path.join(self.save_dir, save_name), bbox_inches='tight')
-        pyplot.show()
+    def draw(self):
+        # 绘图由可视化层完成，首次绘图时才导入matplotlib
+        from . import plot
+        plot.draw(self)
 
     def solve(self):
         return zip(*list(self))
 
+    def __once__(self, name: str, func):
+        """
+        只计算一次的中间结果，多个线程同时请求时同样只计算一次
+        :param name: 名称
+        :param func: 无参数的计算函数
+        """
+        return self.memo.get(name, func)
+
     def clear(self):
-        self.cache_list.clear()
-        self.var_list.clear()
+        self.cache_map.clear()
+        self.memo.clear()
 
     def update(self, start: float or int = None, end: float or int = None, rate: float or int = None,
                signal_type=None, cycle=None, zero_hold: bool = None, deviation: float = None, cache: bool = None,
-               save=None, save_dir=None):
+               thread_safe: bool = None, dtype=None, save=None, save_dir=None):
         if start is not None:
             self.start = start
         if end is not None:
@@ -134,6 +292,13 @@ class Signal(Drawable, metaclass=abc.ABCMeta):
             self.deviation = deviation
         if cache is not None:
             self.cache = cache
+        if thread_safe is not None:
+            self.thread_safe = thread_safe
+            self.cache_map.thread_safe = thread_safe
+            self.memo.thread_safe = thread_safe
+        if dtype is not None:
+            assert numpy.dtype(dtype).kind == 'f'
+            self.dtype = numpy.dtype(dtype)
         if save is not None:
             self.save = save
         if save_dir is not None:
@@ -141,14 +306,6 @@ class Signal(Drawable, metaclass=abc.ABCMeta):
                 assert os.path.exists(save_dir)
             self.save_dir = save_dir
 
-    def __plot__(self, t: list, x: list, x_label: str, t_label: str = "时间", save_name: str = '1.png'):
-        pyplot.plot(t, x)
-        pyplot.xlabel(t_label)
-        pyplot.ylabel(x_label)
-        if self.save:
-            pyplot.savefig(os.path.join(self.save_dir, save_name), bbox_inches='tight')
-        pyplot.show()
-
 
 class RealSignal(Signal, metaclass=abc.ABCMeta):
     # 实数信号基类
@@ -158,21 +315,34 @@ class RealSignal(Signal, metaclass=abc.ABCMeta):
         super(RealSignal, self).__init__(*args, **kwargs)
 
     def __add__(self, other):
-        assert issubclass(type(other), RealSignal)
-        return MultiRealSignal(self, other, "+")
+        return self.__combine__(other, "+")
 
     def __sub__(self, other):
-        assert issubclass(type(other), RealSignal)
-        return MultiRealSignal(self, other, "-")
+        return self.__combine__(other, "-")
 
     def __mul__(self, other):
-        assert issubclass(type(other), RealSignal)
-        return MultiRealSignal(self, other, "*")
+        return self.__combine__(other, "*")
 
     def __pow__(self, other):
         # 卷积运算
+        return self.__combine__(other, "**")
+
+    def __combine__(self, other, multi_type: str):
         assert issubclass(type(other), RealSignal)
-        return MultiRealSignal(self, other, "**")
+        ret = self.__simplify__(other, multi_type, False)
+        if ret is None:
+            ret = other.__simplify__(self, multi_type, True)
+        return MultiRealSignal(self, other, multi_type) if ret is None else ret
+
+    def __simplify__(self, other, multi_type: str, right: bool):
+        """
+        代数化简，可解析表示的信号覆盖该方法，将运算改写为等价的高效形式
+        :param other: 另一个操作数
+        :param multi_type: 运算类型
+        :param right: 本信号是否为右操作数
+        :return: 化简后的信号，无法化简时返回None
+        """
+        return None
 
     def __iter__(self) -> (float or int, float):
         """
@@ -187,7 +357,9 @@ class RealSignal(Signal, metaclass=abc.ABCMeta):
             now = self.start + self.delta * cnt
 
     def __getitem__(self, var: float or int) -> float:
-        if not self.cycle and var < self.start or var > self.end:
+        if isinstance(var, slice):
+            return self.__slice__(var)
+        if not self.cycle and (var < self.start or var > self.end):
             return 0
         ret = super(RealSignal, self).__getitem__(var)
         ret = 0 if math.isclose(ret, 0, abs_tol=self.deviation) else ret
@@ -200,12 +372,8 @@ class RealSignal(Signal, metaclass=abc.ABCMeta):
             self.x_label = x_label
         super(RealSignal, self).update(**kwargs)
 
-    def draw(self):
-        t, y = self.solve()
-        if self.signal_type is int:
-            self.__stem__(t, y, x_label=self.x_label, t_label=self.t_label, save_name='1.png')
-        else:
-            self.__plot__(t, y, x_label=self.x_label, t_label=self.t_label, save_name='1.png')
+    def __view__(self, **kwargs):
+        return RealSignalView(self, **kwargs)
 
 
 class PluralSignal(Signal, metaclass=abc.ABCMeta):
@@ -247,24 +415,37 @@ class PluralSignal(Signal, metaclass=abc.ABCMeta):
             now = self.start + self.delta * cnt
 
     def __getitem__(self, var: float or int) -> (float, float):
-        if not self.cycle and var < self.start or var > self.end:
-            return 0, 0
-        ret1, ret2 = super(PluralSignal, self).__getitem__(var)
-        ret1 = 0 if math.isclose(ret1, 0, abs_tol=self.deviation) else ret1
-        ret2 = 0 if math.isclose(ret2, 0, abs_tol=self.deviation) else ret2
-        return ret1, ret2
-
-    def __plot_3d__(self, t: list, x: list, y: list, x_label: str, y_label: str, t_label: str = "时间",
-                    save_name: str = '1.png'):
-        ax = pyplot.axes(projection="3d")
-        ax.scatter3D(t, x, y)
-        ax.plot3D(t, x, y)
-        ax.set_xlabel(t_label)
-        ax.set_ylabel(x_label)
-        ax.set_zlabel(y_label)
-        if self.save:
-            pyplot.savefig(os.path.join(self.save_dir, save_name), bbox_inches='tight')
-        pyplot.show()
+        # (实部，虚部)兼容接口，内部以complex保存
+        if isinstance(var, slice):
+            return self.__slice__(var)
+        ret = self.value(var)
+        return ret.real, ret.imag
+
+    def value(self, var: float or int) -> complex:
+        """
+        获取var时刻的复数信号状态
+        :param var: 时刻
+        :return: 信号状态
+        """
+        if not self.cycle and (var < self.start or var > self.end):
+            return 0j
+        ret = super(PluralSignal, self).__getitem__(var)
+        # 兼容返回(实部，虚部)的__kernel__
+        return self.__zero__(complex(*ret) if isinstance(ret, tuple) else complex(ret))
+
+    def __zero__(self, ret: complex) -> complex:
+        # 实部与虚部分别按浮点数计算误差置0
+        if abs(ret.real) <= self.deviation or abs(ret.imag) <= self.deviation:
+            ret = complex(0 if abs(ret.real) <= self.deviation else ret.real,
+                          0 if abs(ret.imag) <= self.deviation else ret.imag)
+        return ret
+
+    def evaluate(self, var_array) -> numpy.ndarray:
+        return self.__cast__(numpy.array([self.value(var) for var in numpy.asarray(var_array, dtype=float).tolist()],
+                                         dtype=complex))
+
+    def __view__(self, **kwargs):
+        return PluralSignalView(self, **kwargs)
 
     def update(self, t_label=None, x_label=None, y_label=None, **kwargs):
         if t_label is not None:
@@ -275,120 +456,175 @@ class PluralSignal(Signal, metaclass=abc.ABCMeta):
             self.y_label = y_label
         super(PluralSignal, self).update(**kwargs)
 
-    def draw(self):
-        t, x, y = self.solve()
-        self.__plot_3d__(t, x, y, self.x_label, self.y_label, self.t_label, '1.png')
-        if self.signal_type is int:
-            self.__stem__(t, x, self.x_label, self.t_label, '2.png')
-            self.__stem__(t, y, self.y_label, self.t_label, '3.png')
-            pyplot.scatter(x, y)
-        else:
-            self.__plot__(t, x, self.x_label, self.t_label, '2.png')
-            self.__plot__(t, y, self.y_label, self.t_label, '3.png')
-        self.__plot__(x, y, self.y_label, self.x_label, '4.png')
-
 
-class MultiRealSignal(RealSignal, metaclass=abc.ABCMeta):
-    # 复合实数信号基类
+class MultiSignal(Signal, metaclass=abc.ABCMeta):
+    # 复合信号基类，批量取值，卷积在同一网格上时一次性计算
 
-    def __init__(self, signal1: RealSignal, signal2: RealSignal, multi_type: str, *args, **kwargs):
-        signal_type = int
-        if signal1.signal_type is int and signal2.signal_type is int:
-            assert signal1.delta == signal2.delta
-            rate = signal1.rate
-        elif signal1.signal_type is int:
-            rate = signal1.rate
-        else:
-            if signal2.signal_type is float:
-                signal_type = float
-            rate = signal2.rate
+    def __init__(self, signal1: Signal, signal2: Signal, multi_type: str, *args, **kwargs):
         self.signal1 = signal1
         self.signal2 = signal2
         assert multi_type in ["+", "-", "*", "**"]
         self.multi_type = multi_type
-        end = len(signal1) + len(signal2) - 2 if multi_type == "**" else max(signal1.end, signal2.end)
-        super(MultiRealSignal, self).__init__(*args, start=min(signal1.start, signal2.start), end=end,
-                                              rate=rate, signal_type=signal_type, **kwargs)
+        super(MultiSignal, self).__init__(*args, **__params__(signal1, signal2, multi_type), **kwargs)
 
-    def __getitem__(self, var: float or int) -> float:
+    def __cached__(self, var: float or int):
         if var < self.start or var > self.end:
             return 0
-        if self.cache and var in self.var_list:
-            return self.cache_list[self.var_list.index(var)]
-        ret = 0
+        if not self.cache:
+            return self.__scalar__(var)
+        return self.cache_map.get(var, self.__scalar__, var)
+
+    def __scalar__(self, var: float or int):
+        return self.evaluate([var])[0].item()
+
+    def __convolution__(self) -> numpy.ndarray or None:
+        """
+        两个离散信号在同一网格上时，一次性计算全部卷积结果
+        :return: 卷积结果，第k个元素对应start + (k + m) * delta时刻，m为signal2开始时刻的采样点序号
+        """
+        signal1, signal2 = self.signal1, self.signal2
+        m = signal2.start / self.delta
+        if self.signal_type is not int or signal1.cycle or signal2.cycle or signal1.zero_hold or \
+                signal2.zero_hold or not math.isclose(m, round(m), abs_tol=self.deviation):
+            return None
+        grid = self.start + self.delta * numpy.arange(len(self))
+        # signal2在结果网格的采样间隔上取值，连续信号不能使用其自身的绘制频率
+        count = math.floor((signal2.end - signal2.start) / self.delta + self.deviation) + 1
+        samples = signal2.evaluate(signal2.start + self.delta * numpy.arange(count))
+        return numpy.convolve(__wide__(signal1.evaluate(grid)), __wide__(samples))
+
+    def __values__(self, var_array: numpy.ndarray) -> numpy.ndarray:
         if self.multi_type == '+':
-            ret = self.signal1[var] + self.signal2[var]
+            return self.signal1.evaluate(var_array) + self.signal2.evaluate(var_array)
         elif self.multi_type == '-':
-            ret = self.signal1[var] - self.signal2[var]
+            return self.signal1.evaluate(var_array) - self.signal2.evaluate(var_array)
         elif self.multi_type == '*':
-            ret = self.signal1[var] * self.signal2[var]
-        elif self.multi_type == '**':
-            cnt = 0
-            delt = self.start
-            while delt <= self.end:
-                ret += self.signal1[delt] * self.signal2[var - delt]
-                cnt += 1
-                delt = self.start + self.delta * cnt
-        ret = 0 if math.isclose(ret, 0, abs_tol=self.deviation) else ret
-        if self.cache:
-            self.var_list.append(var)
-            self.cache_list.append(ret)
-        return ret
+            return self.signal1.evaluate(var_array) * self.signal2.evaluate(var_array)
+        convolution = self.__once__('convolution', self.__convolution__)
+        if convolution is not None:
+            k = numpy.round((var_array - self.start - self.signal2.start) / self.delta).astype(int)
+            valid = (k >= 0) & (k < len(convolution))
+            return numpy.where(valid, convolution[numpy.clip(k, 0, len(convolution) - 1)], 0)
+        grid = self.start + self.delta * numpy.arange(len(self))
+        values = self.__once__('values', lambda: __wide__(self.signal1.evaluate(grid)))
+        return numpy.array([numpy.dot(values, __wide__(self.signal2.evaluate(var - grid))) for var in var_array],
+                           dtype=values.dtype)
+
+    def evaluate(self, var_array) -> numpy.ndarray:
+        return self.__fill__(var_array, self.__values__)
+
+
+class MultiRealSignal(MultiSignal, RealSignal, metaclass=abc.ABCMeta):
+    # 复合实数信号基类
+
+    def __getitem__(self, var: float or int) -> float:
+        if isinstance(var, slice):
+            return self.__slice__(var)
+        return self.__cached__(var)
 
 
-class MultiPluralSignal(PluralSignal, metaclass=abc.ABCMeta):
+class MultiPluralSignal(MultiSignal, PluralSignal, metaclass=abc.ABCMeta):
     # 复合复数信号基类
 
-    def __init__(self, signal1: PluralSignal, signal2: PluralSignal, multi_type: str, *args, **kwargs):
-        signal_type = int
-        if signal1.signal_type is int and signal2.signal_type is int:
-            assert signal1.delta == signal2.delta
-            rate = signal1.rate
-        elif signal1.signal_type is int:
-            rate = signal1.rate
-        else:
-            if signal2.signal_type is float:
-                signal_type = float
-            rate = signal2.rate
-        self.signal1 = signal1
-        self.signal2 = signal2
-        assert multi_type in ["+", "-", "*", "**"]
-        self.multi_type = multi_type
-        end = len(signal1) + len(signal2) - 2 if multi_type == "**" else max(signal1.end, signal2.end)
-        super(MultiPluralSignal, self).__init__(*args, start=min(signal1.start, signal2.start), end=end,
-                                                rate=rate, signal_type=signal_type, **kwargs)
+    def value(self, var: float or int) -> complex:
+        return complex(self.__cached__(var))
 
-    def __getitem__(self, var: float or int) -> (float, float):
-        if var < self.start or var > self.end:
-            return 0.0, 0.0
-        if self.cache and var in self.var_list:
-            return self.cache_list[self.var_list.index(var)]
-        x1, y1 = self.signal1[var]
-        x2, y2 = self.signal2[var]
-        ret1 = 0
-        ret2 = 0
-        if self.multi_type == '+':
-            ret1 = x1 + x2
-            ret2 = y1 + y2
-        elif self.multi_type == '-':
-            ret1 = x1 - x2
-            ret2 = y1 - y2
-        elif self.multi_type == '*':
-            ret1 = x1 * x2 - y1 * y2
-            ret2 = x1 * y2 + x2 * y1
-        elif self.multi_type == '**':
-            cnt = 0
-            delt = self.start
-            while delt <= self.end:
-                x1, y1 = self.signal1[delt]
-                x2, y2 = self.signal2[var - delt]
-                ret1 += x1 * x2 - y1 * y2
-                ret2 += x1 * y2 + x2 * y1
-                cnt += 1
-                delt = self.start + self.delta * cnt
-        ret1 = 0 if math.isclose(ret1, 0, abs_tol=self.deviation) else ret1
-        ret2 = 0 if math.isclose(ret2, 0, abs_tol=self.deviation) else ret2
-        if self.cache:
-            self.var_list.append(var)
-            self.cache_list.append((ret1, ret2))
-        return ret1, ret2
+
+class SeqWindow:
+    # 序列窗函数，按视图采样点序号取值，序号超出序列长度时为0
+
+    def __init__(self, seq: list or tuple or numpy.ndarray, start: float or int, delta: float):
+        self.seq = numpy.asarray(seq, dtype=float)
+        self.start = start
+        self.delta = delta
+
+    def __call__(self, var_array: numpy.ndarray) -> numpy.ndarray:
+        n = numpy.round((var_array - self.start) / self.delta).astype(int)
+        valid = (n >= 0) & (n < len(self.seq))
+        ret = numpy.zeros(len(var_array))
+        ret[valid] = self.seq[n[valid]]
+        return ret
+
+
+class SignalView(Signal, metaclass=abc.ABCMeta):
+    # 信号视图基类，不复制数据，var时刻的取值为父信号scale * var + offset时刻的取值乘以窗函数
+
+    def __init__(self, parent: Signal, start: float or int, end: float or int, rate: float or int = None,
+                 scale: float or int = 1, offset: float or int = 0, gain: float = 1, window=None, *args, **kwargs):
+        """
+        :param parent: 父信号
+        :param start: 开始时间
+        :param end: 结束时间
+        :param rate: 采样率，默认与父信号相同
+        :param scale: 时刻缩放
+        :param offset: 时刻偏移
+        :param gain: 幅度缩放
+        :param window: 窗函数
+        :param args: 其他基类参数
+        :param kwargs: 其他基类参数
+        """
+        rate = parent.rate if rate is None else rate
+        for label in ['t_label', 'x_label', 'y_label']:
+            if hasattr(parent, label):
+                kwargs.setdefault(label, getattr(parent, label))
+        windows = []
+        # 在最底层信号时刻上的有效范围
+        bounds = (-math.inf, math.inf)
+        if isinstance(parent, SignalView):
+            # 视图的视图直接映射到最底层信号，避免逐层调用，父视图的时间范围折算为有效范围
+            low, high = sorted([parent.scale * parent.start + parent.offset,
+                                parent.scale * parent.end + parent.offset])
+            bounds = (max(low, parent.bounds[0]), min(high, parent.bounds[1]))
+            windows = [(func, s * scale, s * offset + o) for func, s, o in parent.windows]
+            scale, offset = parent.scale * scale, parent.scale * offset + parent.offset
+            gain = parent.gain * gain
+            parent = parent.parent
+        self.parent = parent
+        self.scale = scale
+        self.offset = offset
+        self.gain = gain
+        self.bounds = bounds
+        # 取值已由父信号缓存，视图本身不再缓存
+        super(SignalView, self).__init__(*args, start=start, end=end, rate=rate, signal_type=parent.signal_type,
+                                         zero_hold=parent.zero_hold, deviation=parent.deviation, cache=False,
+                                         thread_safe=parent.thread_safe, dtype=parent.dtype, **kwargs)
+        if window is not None:
+            if isinstance(window, Signal):
+                window = window.evaluate
+            elif not callable(window):
+                window = SeqWindow(window, self.start, self.delta)
+            windows.append((window, 1, 0))
+        self.windows = windows
+
+    def __weight__(self, var_array: numpy.ndarray) -> numpy.ndarray:
+        ret = numpy.ones(len(var_array))
+        for func, s, o in self.windows:
+            ret = ret * func(s * var_array + o)
+        return ret
+
+    def __values__(self, var_array: numpy.ndarray) -> numpy.ndarray:
+        parent_var = self.scale * var_array + self.offset
+        ret = self.parent.evaluate(parent_var)
+        if self.bounds != (-math.inf, math.inf):
+            outside = (parent_var < self.bounds[0] - self.deviation) | (parent_var > self.bounds[1] + self.deviation)
+            ret = numpy.where(outside, 0, ret)
+        if self.gain != 1:
+            ret = ret * self.gain
+        return ret * self.__weight__(var_array) if self.windows else ret
+
+    def evaluate(self, var_array) -> numpy.ndarray:
+        return self.__fill__(var_array, self.__values__)
+
+
+class RealSignalView(SignalView, RealSignal):
+    # 实数信号视图
+
+    def __kernel__(self, var: float or int) -> float:
+        return float(self.__values__(numpy.array([var], dtype=float))[0])
+
+
+class PluralSignalView(SignalView, PluralSignal):
+    # 复数信号视图
+
+    def __kernel__(self, var: float or int) -> complex:
+        return complex(self.__values__(numpy.array([var], dtype=float))[0])
@@ -0,0 +1,83 @@
+import threading
+
+
+class Cache:
+    """
+    信号取值缓存
+    thread_safe为True时按键分段加锁，多个线程同时请求同一个键时只有一个线程计算，其余线程等待结果
+    """
+
+    def __init__(self, thread_safe: bool = False, stripes: int = 16):
+        """
+        :param thread_safe: 是否线程安全
+        :param stripes: 锁的分段数
+        """
+        assert stripes > 0
+        self.thread_safe = thread_safe
+        self.data = {}
+        self.locks = [threading.Lock() for _ in range(stripes)]
+        # 每个分段中正在计算的键及其完成事件
+        self.pending = [{} for _ in range(stripes)]
+        # 每次clear加1，clear之前开始的计算结果不再写入
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __contains__(self, key) -> bool:
+        return key in self.data
+
+    def get(self, key, func, *args):
+        """
+        获取键对应的值，不存在时调用func(*args)计算并保存
+        :param key: 键
+        :param func: 计算函数
+        :param args: 计算函数的参数
+        :return: 值
+        """
+        try:
+            # 命中时不加锁，dict的单次读取在GIL下是原子的
+            return self.data[key]
+        except KeyError:
+            pass
+        if not self.thread_safe:
+            ret = self.data[key] = func(*args)
+            return ret
+        stripe = hash(key) % len(self.locks)
+        lock = self.locks[stripe]
+        pending = self.pending[stripe]
+        with lock:
+            if key in self.data:
+                return self.data[key]
+            event = pending.get(key)
+            owner = event is None
+            if owner:
+                event = pending[key] = threading.Event()
+                generation = self.generation
+        if not owner:
+            event.wait()
+            # 计算线程出错时由本线程重新计算
+            return self.get(key, func, *args)
+        try:
+            # 计算时不持有锁，递归取值（如Recurrence）不会死锁
+            ret = func(*args)
+            with lock:
+                if generation == self.generation:
+                    self.data[key] = ret
+        finally:
+            with lock:
+                del pending[key]
+            event.set()
+        return ret
+
+    def clear(self):
+        if self.thread_safe:
+            for lock in self.locks:
+                lock.acquire()
+        try:
+            self.data = {}
+            self.generation += 1
+        finally:
+            if self.thread_safe:
+                for lock in self.locks:
+                    lock.release()
@@ -0,0 +1,147 @@
+import abc
+
+import numpy
+from scipy.signal import sosfilt
+
+
+class BlockFilter(metaclass=abc.ABCMeta):
+    # 分块流式滤波器基类，在多次调用之间保留滤波器状态
+
+    def process(self, block) -> numpy.ndarray:
+        """
+        滤波一块输入数据
+        :param block: 一维输入数据块
+        :return: 与输入等长的输出数据块
+        """
+        raise NotImplementedError
+
+    def reset(self):
+        """
+        清空滤波器状态
+        """
+        raise NotImplementedError
+
+    def __call__(self, block) -> numpy.ndarray:
+        return self.process(block)
+
+
+class FIRFilter(BlockFilter):
+    """
+    分块流式FIR滤波器，抽头较长时使用重叠保留法
+    """
+
+    def __init__(self, taps: list or tuple or numpy.ndarray, fft_threshold: int = 64):
+        """
+        :param taps: 抽头系数，即单位冲激响应h(n)
+        :param fft_threshold: 抽头数超过该值时使用重叠保留法
+        """
+        self.taps = numpy.asarray(taps, dtype=float)
+        assert self.taps.ndim == 1 and len(self.taps) > 0
+        self.fft_threshold = fft_threshold
+        # 重叠保留法的FFT长度与每段有效输出长度
+        self.fft_size = 1 << (2 * len(self.taps) - 1).bit_length()
+        self.step = self.fft_size - len(self.taps) + 1
+        self.spectrum = numpy.fft.rfft(self.taps, self.fft_size)
+        self.history = numpy.zeros(len(self.taps) - 1)
+
+    def reset(self):
+        self.history = numpy.zeros(len(self.taps) - 1)
+
+    def process(self, block) -> numpy.ndarray:
+        block = numpy.asarray(block, dtype=float)
+        if block.ndim > 1:
+            # 多通道数据需要每个通道各用一个滤波器
+            raise ValueError("Error block.")
+        block = block.ravel()
+        if len(block) == 0:
+            return numpy.zeros(0)
+        buf = numpy.concatenate((self.history, block))
+        if len(self.taps) > self.fft_threshold:
+            out = self.__overlap_save__(buf, len(block))
+        else:
+            out = numpy.convolve(buf, self.taps, mode='valid')
+        if len(self.history):
+            self.history = buf[len(buf) - len(self.history):]
+        return out
+
+    def __overlap_save__(self, buf: numpy.ndarray, length: int) -> numpy.ndarray:
+        if length == 0:
+            return numpy.zeros(0)
+        frames = -(-length // self.step)
+        padded = numpy.zeros((frames - 1) * self.step + self.fft_size)
+        padded[:len(buf)] = buf
+        segments = numpy.lib.stride_tricks.sliding_window_view(padded, self.fft_size)[::self.step]
+        out = numpy.fft.irfft(numpy.fft.rfft(segments, axis=1) * self.spectrum, self.fft_size, axis=1)
+        # 丢弃每段前len(taps)-1个受循环卷积混叠的点
+        return out[:, len(self.taps) - 1:].ravel()[:length]
+
+
+class IIRFilter(BlockFilter):
+    """
+    分块流式IIR滤波器，系数格式与Recurrence一致，内部分解为二阶节级联以保证数值稳定
+    y(n) = sum(input_params[i] * x(n - i)) - sum(response_params[i] * y(n - i)), i >= 1
+    """
+
+    def __init__(self, response_params: list, input_params: list, deviation: float = 1e-10):
+        """
+        :param response_params: 响应的参数
+        :param input_params: 输入的参数
+        :param deviation: 判断共轭复根的浮点数计算误差
+        """
+        assert len(response_params) > 0 and response_params[0] != 0
+        assert len(input_params) > 0
+        self.response_params = response_params
+        self.input_params = input_params
+        self.deviation = deviation
+        a = numpy.asarray(response_params, dtype=float) / response_params[0]
+        b = numpy.asarray(input_params, dtype=float) / response_params[0]
+        # 分子前导零对应纯延迟
+        nonzero = numpy.flatnonzero(b)
+        self.delay = int(nonzero[0]) if len(nonzero) else 0
+        gain = b[self.delay] if len(nonzero) else 0.0
+        zeros = numpy.roots(b[self.delay:]) if len(nonzero) else numpy.zeros(0)
+        poles = numpy.roots(a)
+        self.sos = self.__sections__(zeros, poles, gain)
+        self.reset()
+
+    def __pair__(self, roots: numpy.ndarray) -> list:
+        # 共轭复根成对，实根按大小两两成对
+        roots = numpy.asarray(roots, dtype=complex)
+        upper = roots[roots.imag > self.deviation]
+        real = numpy.sort(roots[numpy.abs(roots.imag) <= self.deviation].real)
+        groups = [[root, root.conjugate()] for root in upper[numpy.argsort(numpy.abs(upper))]]
+        groups += [list(real[i:i + 2]) for i in range(0, len(real), 2)]
+        return groups
+
+    def __sections__(self, zeros: numpy.ndarray, poles: numpy.ndarray, gain: float) -> numpy.ndarray:
+        zero_groups = self.__pair__(zeros)
+        pole_groups = self.__pair__(poles)
+        count = max(len(zero_groups), len(pole_groups), 1)
+        sos = numpy.zeros((count, 6))
+        for i in range(count):
+            num = numpy.poly(zero_groups[i]).real if i < len(zero_groups) else numpy.ones(1)
+            den = numpy.poly(pole_groups[i]).real if i < len(pole_groups) else numpy.ones(1)
+            sos[i, :len(num)] = num
+            sos[i, 3:3 + len(den)] = den
+        sos[0, :3] *= gain
+        return sos
+
+    def reset(self):
+        self.delay_state = numpy.zeros(self.delay)
+        self.state = numpy.zeros((len(self.sos), 2))
+
+    def process(self, block) -> numpy.ndarray:
+        block = numpy.asarray(block, dtype=float)
+        if block.ndim > 1:
+            # 多通道数据需要每个通道各用一个滤波器
+            raise ValueError("Error block.")
+        block = block.ravel()
+        if self.delay:
+            buf = numpy.concatenate((self.delay_state, block))
+            self.delay_state = buf[len(buf) - self.delay:]
+            block = buf[:len(block)]
+        if len(block) == 0:
+            return numpy.zeros(0)
+        # 直接II型转置结构，状态与scipy的zi格式一致
+        out, self.state = sosfilt(self.sos, block, zi=self.state)
+        return out
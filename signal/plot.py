@@ -0,0 +1,174 @@
+import functools
+import math
+import os
+
+import numpy
+
+from .base import Signal, PluralSignal
+
+# 可视化层，matplotlib只在首次绘图时导入，计算部分不依赖matplotlib
+# 离散信号点数超过该值时改用折线图绘制包络
+STEM_THRESHOLD = 1000
+# 三维图与相图的最大绘制点数
+MAX_POINTS = 5000
+
+
+def envelope(t: numpy.ndarray, x: numpy.ndarray, width: int) -> (numpy.ndarray, numpy.ndarray):
+    """
+    最大最小值包络抽取，每个像素列只保留区间内的最大值和最小值，保证峰值不丢失
+    :param t: 时刻数组
+    :param x: 信号状态数组
+    :param width: 像素宽度
+    :return: 抽取后的(时刻数组，信号状态数组）
+    """
+    n = len(x)
+    if n <= 2 * width:
+        return t, x
+    size = math.ceil(n / width)
+    bins = math.ceil(n / size)
+    pad = bins * size - n
+    tp = numpy.concatenate((t, numpy.repeat(t[-1:], pad))).reshape(bins, size)
+    xp = numpy.concatenate((x, numpy.repeat(x[-1:], pad))).reshape(bins, size)
+    i_min = xp.argmin(axis=1)
+    i_max = xp.argmax(axis=1)
+    # 按时间先后排列每个区间的最小值与最大值
+    index = numpy.stack((numpy.minimum(i_min, i_max), numpy.maximum(i_min, i_max)), axis=1)
+    rows = numpy.arange(bins)[:, None]
+    return tp[rows, index].ravel(), xp[rows, index].ravel()
+
+
+def stride(*arrays: numpy.ndarray, max_points: int = MAX_POINTS) -> list:
+    """
+    等间隔抽取，用于无法使用包络的三维图与相图
+    """
+    step = max(1, math.ceil(len(arrays[0]) / max_points))
+    return [a[::step] for a in arrays]
+
+
+@functools.lru_cache(maxsize=None)
+def __matplotlib__():
+    # 首次绘图时导入matplotlib并设置中文字体，只执行一次
+    import matplotlib
+    matplotlib.rcParams['font.sans-serif'] = ['SimHei']
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    return matplotlib
+
+
+def __pyplot__():
+    __matplotlib__()
+    from matplotlib import pyplot
+    return pyplot
+
+
+def __axes__(save: bool, projection: str = None):
+    __matplotlib__()
+    if save:
+        # 保存时使用无界面的Agg后端，不经过pyplot
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        figure = Figure()
+        FigureCanvasAgg(figure)
+    else:
+        figure = __pyplot__().figure()
+    return figure, figure.add_subplot(projection=projection)
+
+
+def __finish__(figure, save: bool, save_dir: str, save_name: str):
+    if save:
+        figure.savefig(os.path.join(save_dir, save_name), bbox_inches='tight')
+    else:
+        __pyplot__().show()
+
+
+def __width__(figure) -> int:
+    return int(figure.get_figwidth() * figure.dpi)
+
+
+def stem(t: numpy.ndarray, x: numpy.ndarray, x_label: str, t_label: str = "时间", delta: float = None,
+         save: bool = False, save_dir: str = './', save_name: str = '1.png'):
+    figure, ax = __axes__(save)
+    if len(x) <= STEM_THRESHOLD:
+        if delta is not None and len(x) <= 21:
+            from matplotlib.ticker import MultipleLocator
+            ax.xaxis.set_major_locator(MultipleLocator(delta))
+        ax.stem(t, x)
+    else:
+        ax.plot(*envelope(t, x, __width__(figure)))
+    ax.set_xlabel(t_label)
+    ax.set_ylabel(x_label)
+    __finish__(figure, save, save_dir, save_name)
+
+
+def plot(t: numpy.ndarray, x: numpy.ndarray, x_label: str, t_label: str = "时间",
+         save: bool = False, save_dir: str = './', save_name: str = '1.png'):
+    figure, ax = __axes__(save)
+    ax.plot(*envelope(t, x, __width__(figure)))
+    ax.set_xlabel(t_label)
+    ax.set_ylabel(x_label)
+    __finish__(figure, save, save_dir, save_name)
+
+
+def phase(x: numpy.ndarray, y: numpy.ndarray, x_label: str, y_label: str, scatter: bool = False,
+          save: bool = False, save_dir: str = './', save_name: str = '1.png'):
+    figure, ax = __axes__(save)
+    x, y = stride(x, y)
+    if scatter and len(x) <= STEM_THRESHOLD:
+        ax.scatter(x, y)
+    ax.plot(x, y)
+    ax.set_xlabel(x_label)
+    ax.set_ylabel(y_label)
+    __finish__(figure, save, save_dir, save_name)
+
+
+def plot_3d(t: numpy.ndarray, x: numpy.ndarray, y: numpy.ndarray, x_label: str, y_label: str,
+            t_label: str = "时间", save: bool = False, save_dir: str = './', save_name: str = '1.png'):
+    figure, ax = __axes__(save, projection="3d")
+    t, x, y = stride(t, x, y)
+    if len(t) <= STEM_THRESHOLD:
+        ax.scatter3D(t, x, y)
+    ax.plot3D(t, x, y)
+    ax.set_xlabel(t_label)
+    ax.set_ylabel(x_label)
+    ax.set_zlabel(y_label)
+    __finish__(figure, save, save_dir, save_name)
+
+
+def __stem__(signal: Signal, t: numpy.ndarray, x: numpy.ndarray, x_label: str, t_label: str = "时间",
+             save_name: str = '1.png'):
+    stem(t, x, x_label, t_label, delta=signal.delta, save=signal.save, save_dir=signal.save_dir, save_name=save_name)
+
+
+def __plot__(signal: Signal, t: numpy.ndarray, x: numpy.ndarray, x_label: str, t_label: str = "时间",
+             save_name: str = '1.png'):
+    plot(t, x, x_label, t_label, save=signal.save, save_dir=signal.save_dir, save_name=save_name)
+
+
+def __plot_3d__(signal: Signal, t: numpy.ndarray, x: numpy.ndarray, y: numpy.ndarray, x_label: str, y_label: str,
+                t_label: str = "时间", save_name: str = '1.png'):
+    plot_3d(t, x, y, x_label, y_label, t_label, save=signal.save, save_dir=signal.save_dir, save_name=save_name)
+
+
+def __draw__(signal: Signal, t: numpy.ndarray, x: numpy.ndarray, x_label: str, save_name: str):
+    # 离散信号绘制火柴图，连续信号绘制折线图
+    if signal.signal_type is int:
+        __stem__(signal, t, x, x_label, signal.t_label, save_name)
+    else:
+        __plot__(signal, t, x, x_label, signal.t_label, save_name)
+
+
+def draw(signal: Signal):
+    """
+    绘制信号，实数信号绘制一幅图，复数信号绘制三维图、实部、虚部与相图四幅图
+    :param signal: 信号
+    """
+    # 只计算一次，所有图共用同一组数组
+    t, z = signal.solve_array()
+    if not isinstance(signal, PluralSignal):
+        __draw__(signal, t, z, signal.x_label, '1.png')
+        return
+    x, y = z.real, z.imag
+    __plot_3d__(signal, t, x, y, signal.x_label, signal.y_label, signal.t_label, '1.png')
+    __draw__(signal, t, x, signal.x_label, '2.png')
+    __draw__(signal, t, y, signal.y_label, '3.png')
+    phase(x, y, signal.x_label, signal.y_label, scatter=signal.signal_type is int, save=signal.save,
+          save_dir=signal.save_dir, save_name='4.png')
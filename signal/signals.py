@@ -1,9 +1,239 @@
 import math
 from collections.abc import Callable
-from .base import RealSignal, PluralSignal
 
+import numpy
 
-class Impulse(RealSignal):
+from .base import RealSignal, PluralSignal, __params__, __dtype__, __wide__
+
+
+def __discrete__(*signals: RealSignal) -> bool:
+    # 离散信号采样率相同且开始时刻都在同一整数网格上时，才能安全地解析化简
+    delta = signals[0].delta
+    for signal in signals:
+        if signal.signal_type is not int or signal.cycle or signal.zero_hold or signal.delta != delta:
+            return False
+        n = signal.start / delta
+        if not math.isclose(n, round(n), abs_tol=signal.deviation):
+            return False
+    return True
+
+
+def __continuous__(*signals: RealSignal) -> bool:
+    for signal in signals:
+        if signal.signal_type is not float or signal.cycle:
+            return False
+    return True
+
+
+def __level__(first: numpy.ndarray, last: numpy.ndarray, value: numpy.ndarray, n: numpy.ndarray) -> numpy.ndarray:
+    # 互不重叠且按开始序号排序的游程在采样点序号n上的强度，二分查找
+    if len(first) == 0:
+        return numpy.zeros(len(n))
+    i = numpy.searchsorted(first, n, side='right') - 1
+    index = numpy.clip(i, 0, None)
+    return numpy.where((i >= 0) & (n <= last[index]), value[index], 0)
+
+
+class PrimitiveSignal(RealSignal):
+    """
+    可解析表示为分段常数的基本信号，只保存分段，取值、运算的代价与分段数有关，与时间范围无关
+    加减运算化简为分段常数信号；离散信号之间的乘法、冲激串与分段常数信号的卷积同样化简为分段常数信号
+    """
+
+    def __segments__(self) -> list:
+        """
+        :return: 分段列表[(开始时刻，结束时刻，强度）]，闭区间
+        """
+        raise NotImplementedError
+
+    def __arrays__(self) -> (numpy.ndarray, numpy.ndarray, numpy.ndarray):
+        """
+        :return: 分段的数组表示(开始时刻，结束时刻，强度），不含空分段
+        """
+        segments = numpy.array(self.__segments__(), dtype=float).reshape(-1, 3)
+        segments = segments[segments[:, 0] <= segments[:, 1]]
+        return segments[:, 0], segments[:, 1], segments[:, 2]
+
+    def __clipped__(self) -> (numpy.ndarray, numpy.ndarray, numpy.ndarray):
+        # 截取到信号范围内的分段，范围外的分段单独取值时被屏蔽，与其他信号相加后不能重新出现
+        low, high, strength = self.__arrays__()
+        low, high = numpy.maximum(low, self.start), numpy.minimum(high, self.end)
+        keep = low <= high
+        return low[keep], high[keep], strength[keep]
+
+    def __breaks__(self) -> (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray):
+        # 分段开始、结束时刻分别排序，并计算对应强度的前缀和
+        low, high, strength = self.__arrays__()
+        low_order, high_order = numpy.argsort(low, kind='stable'), numpy.argsort(high, kind='stable')
+        return (low[low_order] - self.deviation, numpy.concatenate(([0], numpy.cumsum(strength[low_order]))),
+                high[high_order] + self.deviation, numpy.concatenate(([0], numpy.cumsum(strength[high_order]))))
+
+    def __runs__(self) -> (numpy.ndarray, numpy.ndarray, numpy.ndarray):
+        """
+        离散信号的规范游程表示，游程互不重叠、按开始序号排序且强度非零，只保留信号范围内的部分
+        :return: (开始采样点序号，结束采样点序号，强度），序号为时刻除以采样间隔
+        """
+        low, high, strength = self.__arrays__()
+        lower = math.ceil(self.start / self.delta - self.deviation)
+        upper = math.floor(self.end / self.delta + self.deviation)
+        first = numpy.maximum(numpy.ceil((low - self.deviation) / self.delta), lower).astype(int)
+        last = numpy.minimum(numpy.floor((high + self.deviation) / self.delta), upper).astype(int)
+        keep = first <= last
+        edges, inverse = numpy.unique(numpy.concatenate((first[keep], last[keep] + 1)), return_inverse=True)
+        level = numpy.cumsum(numpy.bincount(inverse, weights=numpy.concatenate((strength[keep], -strength[keep])),
+                                            minlength=len(edges)))[:-1]
+        nonzero = numpy.abs(level) > self.deviation
+        return edges[:-1][nonzero], edges[1:][nonzero] - 1, level[nonzero]
+
+    def __kernel__(self, var: float or int) -> float:
+        return float(self.__values__(numpy.array([var], dtype=float))[0])
+
+    def __values__(self, var_array: numpy.ndarray) -> numpy.ndarray:
+        # 强度为开始时刻不晚于var的分段之和减去结束时刻早于var的分段之和
+        low, low_sum, high, high_sum = self.__once__('breaks', self.__breaks__)
+        return low_sum[numpy.searchsorted(low, var_array, side='right')] - \
+            high_sum[numpy.searchsorted(high, var_array, side='left')]
+
+    def evaluate(self, var_array) -> numpy.ndarray:
+        if self.cycle:
+            return super(PrimitiveSignal, self).evaluate(var_array)
+        return self.__fill__(var_array, self.__values__)
+
+    def __simplify__(self, other, multi_type: str, right: bool):
+        signal1, signal2 = (other, self) if right else (self, other)
+        if multi_type in ['+', '-']:
+            if not isinstance(other, PrimitiveSignal):
+                return None
+            if not __discrete__(self, other) and not __continuous__(self, other):
+                return None
+            sign = 1 if multi_type == '+' else -1
+            low1, high1, strength1 = signal1.__clipped__()
+            low2, high2, strength2 = signal2.__clipped__()
+            segments = numpy.stack((numpy.concatenate((low1, low2)), numpy.concatenate((high1, high2)),
+                                    numpy.concatenate((strength1, sign * strength2))), axis=1)
+            return PiecewiseSignal(segments, **__params__(signal1, signal2, multi_type))
+        if not __discrete__(self):
+            return None
+        if multi_type == '*':
+            return self.__product__(other, __params__(signal1, signal2, multi_type))
+        if not isinstance(other, PrimitiveSignal) or not __discrete__(self, other):
+            return None
+        return self.__convolve__(signal1, signal2, __params__(signal1, signal2, multi_type))
+
+    def __product__(self, other, params: dict):
+        runs = self.__runs__()
+        first, last, value = runs
+        if numpy.all(first == last):
+            # 冲激串与任意信号的乘积只需在冲激时刻取值
+            value = value * other.evaluate(first * self.delta)
+        elif isinstance(other, PrimitiveSignal) and __discrete__(self, other):
+            # 两个分段常数信号的乘积，在全部游程边界划分的区间上强度为常数
+            runs2 = other.__runs__()
+            edges = numpy.unique(numpy.concatenate((first, last + 1, runs2[0], runs2[1] + 1)))
+            first, last = edges[:-1], edges[1:] - 1
+            value = __level__(*runs, first) * __level__(*runs2, first)
+        else:
+            return None
+        return __piecewise__(first, last, value, self.delta, self.deviation, params)
+
+    def __convolve__(self, signal1, signal2, params: dict):
+        # 冲激串与分段常数信号的卷积为各游程平移缩放后的叠加，代价为两者游程数之积
+        first1, last1, value1 = signal1.__runs__()
+        first2, last2, value2 = signal2.__runs__()
+        # 左操作数只在卷积求和范围内取值
+        lower = math.ceil(params['start'] / self.delta - self.deviation)
+        upper = math.floor(params['end'] / self.delta + self.deviation)
+        first1, last1 = numpy.maximum(first1, lower), numpy.minimum(last1, upper)
+        keep = first1 <= last1
+        first1, last1, value1 = first1[keep], last1[keep], value1[keep]
+        if numpy.all(first1 == last1):
+            points, value, first, last = first1, value1, first2, last2
+            strength = value2
+        elif numpy.all(first2 == last2):
+            points, value, first, last = first2, value2, first1, last1
+            strength = value1
+        else:
+            return None
+        return __piecewise__((points[:, None] + first[None, :]).ravel(), (points[:, None] + last[None, :]).ravel(),
+                             (value[:, None] * strength[None, :]).ravel(), self.delta, self.deviation, params)
+
+
+def __piecewise__(first: numpy.ndarray, last: numpy.ndarray, value: numpy.ndarray, delta: float, deviation: float,
+                  params: dict):
+    # 由采样点序号表示的游程构造分段常数信号，游程截取到结果的时间范围内
+    first = numpy.maximum(first, math.ceil(params['start'] / delta - deviation))
+    last = numpy.minimum(last, math.floor(params['end'] / delta + deviation))
+    keep = (numpy.abs(value) > deviation) & (first <= last)
+    return PiecewiseSignal(numpy.stack((first[keep] * delta, last[keep] * delta, value[keep]), axis=1), **params)
+
+
+class PiecewiseSignal(PrimitiveSignal):
+    """
+    分段常数信号，即稀疏信号，冲激以起止时刻相同的分段表示
+    """
+
+    def __init__(self, segments: list or numpy.ndarray, *args, **kwargs):
+        """
+        :param segments: 分段列表[(开始时刻，结束时刻，强度）]或形状为(分段数, 3)的数组，闭区间，重叠部分强度相加
+        :param args: 其他基类参数
+        :param kwargs: 其他基类参数
+        """
+        self.segments = numpy.array(segments, dtype=float).reshape(-1, 3)
+        super(PiecewiseSignal, self).__init__(*args, **kwargs)
+
+    def __segments__(self) -> list:
+        return [tuple(segment) for segment in self.segments.tolist()]
+
+    def __arrays__(self) -> (numpy.ndarray, numpy.ndarray, numpy.ndarray):
+        segments = self.segments[self.segments[:, 0] <= self.segments[:, 1]]
+        return segments[:, 0], segments[:, 1], segments[:, 2]
+
+    @staticmethod
+    def encode(signal: RealSignal, **kwargs):
+        """
+        将离散信号按游程编码为分段常数信号，只保留非零游程
+        :param signal: 离散信号
+        :param kwargs: 其他基类参数
+        :return: 分段常数信号
+        """
+        assert signal.signal_type is int and not signal.cycle
+        t, x = signal.solve_array()
+        change = numpy.flatnonzero(x[1:] != x[:-1]) + 1
+        first = numpy.concatenate(([0], change))
+        last = numpy.concatenate((change, [len(x)])) - 1
+        keep = x[first] != 0
+        segments = numpy.stack((t[first[keep]], t[last[keep]], x[first[keep]]), axis=1)
+        for key in ['thread_safe', 'dtype', 't_label', 'x_label']:
+            kwargs.setdefault(key, getattr(signal, key))
+        return PiecewiseSignal(segments, start=signal.start, end=signal.end, rate=signal.rate,
+                               signal_type=int, deviation=signal.deviation, **kwargs)
+
+
+class Comb(PiecewiseSignal):
+    """
+    实数冲激串，即采样用的梳状信号，只保存冲激时刻
+    """
+
+    def __init__(self, start: float or int = 0, end: float or int = 0, period: float or int = 1,
+                 strength: float = 1, *args, **kwargs):
+        """
+        :param start: 开始时间，第一个冲激的时刻
+        :param end: 停止时间
+        :param period: 冲激间隔，与采样间隔对齐
+        :param strength: 强度
+        :param args: 其他基类参数
+        :param kwargs: 其他基类参数
+        """
+        super(Comb, self).__init__([], start, end, *args, **kwargs)
+        step = round(period / self.delta)
+        assert step >= 1
+        self.period = step * self.delta
+        self.strength = strength
+        t = self.start + self.delta * numpy.arange(0, len(self), step)
+        self.segments = numpy.stack((t, t, numpy.full(len(t), strength, dtype=float)), axis=1)
+
+
+class Impulse(PrimitiveSignal):
     """
     实数冲激信号
     """
@@ -33,11 +263,29 @@ class Impulse(RealSignal):
         self.switch = (self.switch - self.start) // self.delta
         self.switch = self.switch * self.delta + self.start
 
-    def __kernel__(self, var: float or int) -> float:
-        return self.strength if var == self.switch else 0
+    def __segments__(self) -> list:
+        return [(self.switch, self.switch, self.strength)]
+
+    def __simplify__(self, other, multi_type: str, right: bool):
+        if multi_type not in ['*', '**'] or not __discrete__(self, other):
+            return super(Impulse, self).__simplify__(other, multi_type, right)
+        params = __params__(other, self, multi_type) if right else __params__(self, other, multi_type)
+        if multi_type == '*':
+            # 乘积只在冲激时刻非零
+            return PiecewiseSignal([(self.switch, self.switch, self.strength * other[self.switch])], **params)
+        # 与冲激的卷积即平移与缩放
+        start, end = params['start'], params['end']
+        if right:
+            if start + self.switch > end or end + self.switch < start:
+                return PiecewiseSignal([], **params)
+            # 左操作数只在卷积求和范围内取值
+            other = other[start:end]
+        elif not start - self.deviation <= self.switch <= end + self.deviation:
+            return PiecewiseSignal([], **params)
+        return other.__view__(start=start, end=end, rate=params['rate'], offset=-self.switch, gain=self.strength)
 
 
-class Step(RealSignal):
+class Step(PrimitiveSignal):
     """
     实数阶跃信号
     """
@@ -67,8 +315,24 @@ class Step(RealSignal):
         self.switch = (self.switch - self.start) // self.delta
         self.switch = self.switch * self.delta + self.start
 
-    def __kernel__(self, var: float or int) -> float:
-        return self.strength if var >= self.switch else 0.0
+    def __segments__(self) -> list:
+        return [(self.switch, self.end, self.strength)]
+
+    def __simplify__(self, other, multi_type: str, right: bool):
+        if multi_type != '**' or not __discrete__(self, other):
+            return super(Step, self).__simplify__(other, multi_type, right)
+        # 与阶跃的卷积即滑动区间求和，用前缀和计算
+        if right:
+            params = __params__(other, self, multi_type)
+            upper = self.end
+            low, high = max(other.start, params['start']), min(other.end, params['end'])
+        else:
+            params = __params__(self, other, multi_type)
+            upper = min(self.end, params['end'])
+            low, high = other.start, other.end
+        if low > high:
+            return PiecewiseSignal([], **params)
+        return AccumulateSignal(other, self.switch, upper, low, high, self.strength, **params)
 
 
 class RealFormulaSignal(RealSignal):
@@ -76,7 +340,7 @@ class RealFormulaSignal(RealSignal):
     使用实数公式或函数构建信号
     """
 
-    def __init__(self, formula: Callable[float or int], *args, **kwargs):
+    def __init__(self, formula: Callable[..., float], *args, **kwargs):
         """
         :param formula: 公式或函数
         :param args: 其他基类参数
@@ -92,16 +356,16 @@ class RealFormulaSignal(RealSignal):
 class PluralFormulaSignal(PluralSignal):
     # 使用复数公式或函数构建信号
 
-    def __init__(self, formula: Callable[float or int], *args, **kwargs):
+    def __init__(self, formula: Callable[..., float], *args, **kwargs):
         """
-        :param formula: 公式或函数
+        :param formula: 公式或函数，返回complex或(实部，虚部)
         :param args: 其他基类参数
         :param kwargs: 其他基类参数
         """
         self.formula = formula
         super(PluralFormulaSignal, self).__init__(*args, **kwargs)
 
-    def __kernel__(self, var: float or int) -> (float, float):
+    def __kernel__(self, var: float or int) -> complex or (float, float):
         return self.formula(var)
 
 
@@ -123,22 +387,48 @@ class RealSeqSignal(RealSignal):
         var = int((var - self.start) / self.delta)
         return self.seq[var] if var < len(self.seq) else 0
 
+    def evaluate(self, var_array) -> numpy.ndarray:
+        if self.cycle:
+            return super(RealSeqSignal, self).evaluate(var_array)
+        return self.__fill__(var_array, self.__values__)
+
+    def __values__(self, var_array: numpy.ndarray) -> numpy.ndarray:
+        seq = numpy.asarray(self.seq, dtype=float)
+        n = ((var_array - self.start) / self.delta).astype(int)
+        valid = n < len(seq)
+        ret = numpy.zeros(len(var_array))
+        ret[valid] = seq[n[valid]]
+        return ret
+
 
 class PluralSeqSignal(PluralSignal):
     # 使用复数迭代列表构建信号
 
     def __init__(self, seq: list or tuple, *args, **kwargs):
         """
-        :param seq: 可迭代的数据列表
+        :param seq: 可迭代的数据列表，元素为实数或complex
         :param args: 其他基类参数
         :param kwargs: 其他基类参数
         """
         self.seq = seq
         super(PluralSeqSignal, self).__init__(*args, **kwargs)
 
-    def __kernel__(self, var: float or int) -> (float, float):
+    def __kernel__(self, var: float or int) -> complex:
         var = int((var - self.start) / self.delta)
-        return self.seq[var] if var < len(self.seq) else 0, 0
+        return complex(self.seq[var]) if var < len(self.seq) else 0j
+
+    def evaluate(self, var_array) -> numpy.ndarray:
+        if self.cycle:
+            return super(PluralSeqSignal, self).evaluate(var_array)
+        return self.__fill__(var_array, self.__values__)
+
+    def __values__(self, var_array: numpy.ndarray) -> numpy.ndarray:
+        seq = numpy.asarray(self.seq, dtype=complex)
+        n = ((var_array - self.start) / self.delta).astype(int)
+        valid = n < len(seq)
+        ret = numpy.zeros(len(var_array), dtype=complex)
+        ret[valid] = seq[n[valid]]
+        return ret
 
 
 class SamplerSignal(RealSignal):
@@ -153,3 +443,128 @@ class SamplerSignal(RealSignal):
 
     def __kernel__(self, var: float or int) -> float:
         return math.sin(var) / var
+
+
+class AccumulateSignal(RealSignal):
+    """
+    滑动区间求和信号 y(t) = strength * sum(x(u))，u取遍[low, high]内满足t - upper <= u <= t - lower的采样点
+    """
+
+    def __init__(self, signal: RealSignal, lower: float or int, upper: float or int, low: float or int,
+                 high: float or int, strength: float = 1, *args, **kwargs):
+        """
+        :param signal: 被求和的离散信号
+        :param lower: 区间下界偏移
+        :param upper: 区间上界偏移
+        :param low: 求和范围的开始时间
+        :param high: 求和范围的结束时间
+        :param strength: 强度
+        :param args: 其他基类参数
+        :param kwargs: 其他基类参数
+        """
+        self.signal = signal
+        self.lower = lower
+        self.upper = upper
+        self.low = low
+        self.high = high
+        self.strength = strength
+        super(AccumulateSignal, self).__init__(*args, **kwargs)
+
+    def __prefix__(self) -> numpy.ndarray:
+        count = round((self.high - self.low) / self.signal.delta) + 1
+        values = self.signal.evaluate(self.low + self.signal.delta * numpy.arange(count))
+        return numpy.concatenate(([0], numpy.cumsum(__wide__(values))))
+
+    def __values__(self, var_array: numpy.ndarray) -> numpy.ndarray:
+        prefix = self.__once__('prefix', self.__prefix__)
+        delta = self.signal.delta
+        first = numpy.ceil((var_array - self.upper - self.low) / delta - self.deviation)
+        last = numpy.floor((var_array - self.lower - self.low) / delta + self.deviation)
+        first = numpy.clip(first, 0, len(prefix) - 1).astype(int)
+        last = numpy.clip(last + 1, 0, len(prefix) - 1).astype(int)
+        return self.strength * numpy.where(last > first, prefix[last] - prefix[first], 0)
+
+    def __kernel__(self, var: float or int) -> float:
+        return float(self.__values__(numpy.array([var], dtype=float))[0])
+
+    def evaluate(self, var_array) -> numpy.ndarray:
+        if self.cycle:
+            return super(AccumulateSignal, self).evaluate(var_array)
+        return self.__fill__(var_array, self.__values__)
+
+
+class PeriodicSignal(RealSignal):
+    """
+    周期离散信号，只保存一个周期，任意时刻取值为O(1)，周期信号之间的卷积为基于FFT的循环卷积
+    """
+
+    def __init__(self, period: list or tuple or numpy.ndarray or RealSignal, start: float or int = 0,
+                 rate: float or int = 1, *args, **kwargs):
+        """
+        :param period: 一个周期的数据，或以其时间范围为一个周期的离散信号
+        :param start: 周期开始时间，period为信号时取信号的开始时间
+        :param rate: 采样率，period为信号时取信号的采样率
+        :param args: 其他基类参数
+        :param kwargs: 其他基类参数
+        """
+        if isinstance(period, RealSignal):
+            assert period.signal_type is int
+            start, rate = period.start, period.rate
+            period = period.solve_array()[1]
+        self.period = numpy.array(period, dtype=float)
+        assert self.period.ndim == 1 and len(self.period) > 0
+        end = start + (len(self.period) - 1) / rate
+        super(PeriodicSignal, self).__init__(*args, start=start, end=end, rate=rate, signal_type=int, cycle=True,
+                                             cache=False, **kwargs)
+        self.period[numpy.abs(self.period) <= self.deviation] = 0
+
+    def __len__(self) -> int:
+        return len(self.period)
+
+    def __position__(self, var_array: numpy.ndarray) -> (numpy.ndarray, numpy.ndarray):
+        # 采样点序号与是否在采样点上
+        u = (var_array - self.start) / self.delta
+        n = numpy.round(u)
+        valid = numpy.ones(len(u), dtype=bool) if self.zero_hold else numpy.abs(u - n) * self.delta <= self.deviation
+        return n.astype(int) % len(self.period), valid
+
+    def __getitem__(self, var: float or int) -> float:
+        if isinstance(var, slice):
+            return self.__slice__(var)
+        n, valid = self.__position__(numpy.array([var], dtype=float))
+        return float(self.period[n[0]]) if valid[0] else 0
+
+    def __kernel__(self, var: float or int) -> float:
+        return self[var]
+
+    def evaluate(self, var_array) -> numpy.ndarray:
+        n, valid = self.__position__(numpy.asarray(var_array, dtype=float))
+        return self.__cast__(numpy.where(valid, self.period[n], 0))
+
+    def solve_array(self) -> (numpy.ndarray, numpy.ndarray):
+        return self.start + self.delta * numpy.arange(len(self.period)), self.__cast__(self.period.copy())
+
+    def __aligned__(self, other) -> numpy.ndarray:
+        # 另一个周期信号从本信号开始时刻起的一个周期
+        shift = round((self.start - other.start) / self.delta)
+        return numpy.roll(other.period, -shift)
+
+    def __simplify__(self, other, multi_type: str, right: bool):
+        if not isinstance(other, PeriodicSignal) or len(other) != len(self) or other.delta != self.delta:
+            return None
+        shift = (self.start - other.start) / self.delta
+        if not math.isclose(shift, round(shift), abs_tol=self.deviation):
+            return None
+        period1, period2 = (self.__aligned__(other), self.period) if right else (self.period, self.__aligned__(other))
+        start = self.start
+        if multi_type == '+':
+            period = period1 + period2
+        elif multi_type == '-':
+            period = period1 - period2
+        elif multi_type == '*':
+            period = period1 * period2
+        else:
+            # 循环卷积，结果的开始时刻为两个开始时刻之和
+            period = numpy.fft.irfft(numpy.fft.rfft(self.period) * numpy.fft.rfft(other.period), len(self))
+            start = self.start + other.start
+        return PeriodicSignal(period, start=start, rate=self.rate, dtype=__dtype__(self, other))
@@ -1,6 +1,7 @@
-import math
+import numpy
 
-from .base import Signal, RealSignal, PluralSignal, MultiPluralSignal
+from .base import Signal, RealSignal, PluralSignal, MultiPluralSignal, __wide__
+from .signals import PeriodicSignal
 
 
 class Sampler(RealSignal):
@@ -18,12 +19,117 @@ class Sampler(RealSignal):
         end = signal.end
         rate = (sample_num - 1) / (start - end)
         self.signal = signal
+        kwargs.setdefault('dtype', signal.dtype)
         super(Sampler, self).__init__(*args, start=start, end=end, rate=rate, **kwargs)
 
     def __kernel__(self, var: float or int) -> float:
         return self.signal[var]
 
 
+class Reconstructor(RealSignal):
+    """
+    带限信号重建，Whittaker–Shannon插值 x(t) = sum(x(n) * sinc((t - t_n) / T))
+    """
+
+    def __init__(self, signal: RealSignal, start: float or int, end: float or int, rate: float or int,
+                 mode: str = 'matrix', width: int = 32, block: int = 4096, *args, **kwargs):
+        """
+        :param signal: 离散信号
+        :param start: 输出开始时间
+        :param end: 输出结束时间
+        :param rate: 输出时间网格的频率
+        :param mode: 'matrix'为分块矩阵乘法，精确计算；'window'为截断的Lanczos窗sinc核，每点只用2 * width个采样点；
+                     'fft'为频域补零的循环插值：采样序列先在时域补零到2N点以抑制首尾混叠，插值函数以2N个采样间隔为周期，
+                     与Whittaker–Shannon插值近似而不相等，要求输出频率为采样率的整数倍，不在输出网格上的时刻按同一插值函数直接计算
+        :param width: 'window'模式单侧的采样点数
+        :param block: 每块计算的输出点数，限制内存占用
+        :param args: 其他基类参数
+        :param kwargs: 其他基类参数
+        """
+        assert signal.signal_type is int
+        if mode not in ['matrix', 'window', 'fft']:
+            raise ValueError("Error mode.")
+        if mode == 'fft' and (rate < signal.rate or not numpy.isclose(rate / signal.rate, round(rate / signal.rate))):
+            raise ValueError("Error rate.")
+        assert width > 0 and block > 0
+        self.signal = signal
+        self.mode = mode
+        self.width = width
+        self.block = block
+        kwargs.setdefault('dtype', signal.dtype)
+        super(Reconstructor, self).__init__(*args, start=start, end=end, rate=rate, signal_type=float, **kwargs)
+
+    def __samples__(self) -> numpy.ndarray:
+        return self.__once__('samples', lambda: self.signal.solve_array()[1].astype(float))
+
+    def __spectrum__(self) -> numpy.ndarray:
+        # 时域补零到2N点后的频谱
+        samples = self.__samples__()
+        return numpy.fft.rfft(samples, 2 * len(samples))
+
+    def __upsample__(self, factor: int) -> numpy.ndarray:
+        # 频谱补零，奈奎斯特频点平分到正负频率
+        spectrum = self.__once__('spectrum', self.__spectrum__)
+        length = 2 * len(self.__samples__())
+        padded = numpy.zeros(length * factor // 2 + 1, dtype=complex)
+        padded[:len(spectrum)] = spectrum
+        if factor > 1:
+            padded[length // 2] *= 0.5
+        return numpy.fft.irfft(padded, length * factor) * factor
+
+    def __circular__(self, u: numpy.ndarray) -> numpy.ndarray:
+        # 与__upsample__相同的三角插值函数在任意时刻的取值
+        spectrum = self.__once__('spectrum', self.__spectrum__)
+        length = 2 * len(self.__samples__())
+        weight = numpy.full(len(spectrum), 2.0)
+        weight[0] = weight[-1] = 1
+        kernel = numpy.exp(2j * numpy.pi * numpy.outer(u, numpy.arange(len(spectrum))) / length)
+        return (kernel @ (weight * spectrum)).real / length
+
+    def __matrix__(self, u: numpy.ndarray) -> numpy.ndarray:
+        # u为以采样间隔为单位、相对第一个采样点的时刻
+        samples = self.__samples__()
+        n = numpy.arange(len(samples))
+        return numpy.sinc(u[:, None] - n[None, :]) @ samples
+
+    def __window__(self, u: numpy.ndarray) -> numpy.ndarray:
+        samples = self.__samples__()
+        index = numpy.floor(u)[:, None] + numpy.arange(1 - self.width, self.width + 1)[None, :]
+        distance = u[:, None] - index
+        kernel = numpy.sinc(distance) * numpy.sinc(distance / self.width)
+        index = index.astype(int)
+        valid = (index >= 0) & (index < len(samples))
+        return numpy.sum(numpy.where(valid, kernel * samples[numpy.clip(index, 0, len(samples) - 1)], 0), axis=1)
+
+    def __fft__(self, u: numpy.ndarray) -> numpy.ndarray:
+        factor = round(self.rate / self.signal.rate)
+        ret = numpy.empty(len(u))
+        index = numpy.round(u * factor)
+        aligned = numpy.abs(u * factor - index) <= factor * self.deviation / self.signal.delta
+        if numpy.any(aligned):
+            upsampled = self.__once__('upsampled', lambda: self.__upsample__(factor))
+            # 循环插值按周期延拓
+            ret[aligned] = upsampled[index[aligned].astype(int) % len(upsampled)]
+        if not numpy.all(aligned):
+            ret[~aligned] = self.__circular__(u[~aligned])
+        return ret
+
+    def __values__(self, var_array: numpy.ndarray) -> numpy.ndarray:
+        u = (var_array - self.signal.start) / self.signal.delta
+        if len(u) == 0:
+            return numpy.zeros(0)
+        func = {'matrix': self.__matrix__, 'window': self.__window__, 'fft': self.__fft__}[self.mode]
+        return numpy.concatenate([func(u[i:i + self.block]) for i in range(0, len(u), self.block)])
+
+    def __kernel__(self, var: float or int) -> float:
+        return float(self.__values__(numpy.array([var], dtype=float))[0])
+
+    def evaluate(self, var_array) -> numpy.ndarray:
+        if self.cycle:
+            return super(Reconstructor, self).evaluate(var_array)
+        return self.__fill__(var_array, self.__values__)
+
+
 class Recurrence(RealSignal):
     def __init__(self, response_params: list, input_params: list, input_signal: RealSignal, *args, **kwargs):
         """
@@ -36,6 +142,7 @@ class Recurrence(RealSignal):
         self.response_params = response_params
         self.input_signal = input_signal
         self.input_params = input_params
+        kwargs.setdefault('dtype', input_signal.dtype)
         super(Recurrence, self).__init__(*args, start=input_signal.start, end=input_signal.end,
                                          rate=input_signal.rate, **kwargs)
 
@@ -58,11 +165,19 @@ class RealToPlural(PluralSignal):
         :param signal: 待变换的信号
         """
         self.signal = signal
+        kwargs.setdefault('thread_safe', signal.thread_safe)
+        kwargs.setdefault('dtype', signal.dtype)
         super(RealToPlural, self).__init__(start=signal.start, end=signal.end,
                                            rate=signal.rate, signal_type=signal.signal_type, **kwargs)
 
-    def __kernel__(self, var: float or int) -> (float, float):
-        return self.signal[var], 0
+    def __kernel__(self, var: float or int) -> complex:
+        return complex(self.signal[var])
+
+    def __values__(self, var_array: numpy.ndarray) -> numpy.ndarray:
+        return self.signal.evaluate(var_array).astype(complex)
+
+    def evaluate(self, var_array) -> numpy.ndarray:
+        return self.__fill__(var_array, self.__values__)
 
 
 class FT(PluralSignal):
@@ -85,20 +200,41 @@ class FT(PluralSignal):
             raise ValueError("Error direction.")
         end = self.signal.end if length is None else length - 1
         self.length = len(signal) if length is None else length
+        self.period = None
+        if isinstance(signal, PeriodicSignal) and self.length == len(signal):
+            # 周期信号直接使用保存的一个周期
+            self.period = signal.period
+        kwargs.setdefault('dtype', self.signal.dtype)
         super(FT, self).__init__(start=0, end=end, *args, **kwargs)
 
-    def __kernel__(self, var: float or int) -> (float, float):
-        ret1 = ret2 = 0
-        for i in range(self.length):
-            x1, y1 = self.signal.get_nth(i)
-            x2 = math.cos(self.direction * 2 * math.pi * i * var / self.length)
-            y2 = math.sin(self.direction * 2 * math.pi * i * var / self.length)
-            ret1 += x1 * x2 - y1 * y2
-            ret2 += x1 * y2 + x2 * y1
-        if self.direction == 1:
-            ret1 /= self.length
-            ret2 /= self.length
-        return ret1, ret2
+    def __samples__(self) -> numpy.ndarray:
+        if self.period is not None:
+            return self.period.astype(complex)
+        # 输入信号的N个采样点只取值一次，以complex128做FFT
+        return __wide__(self.signal.evaluate(self.signal.start + self.signal.delta * numpy.arange(self.length)))
+
+    def __spectrum__(self) -> numpy.ndarray:
+        samples = self.__once__('samples', self.__samples__)
+        return numpy.fft.fft(samples) if self.direction == -1 else numpy.fft.ifft(samples)
+
+    def __values__(self, var_array: numpy.ndarray) -> numpy.ndarray:
+        ret = numpy.empty(len(var_array), dtype=complex)
+        integer = var_array == numpy.round(var_array)
+        if numpy.any(integer):
+            ret[integer] = self.__once__('spectrum', self.__spectrum__)[var_array[integer].astype(int) % self.length]
+        if not numpy.all(integer):
+            # 非整数频点按定义计算
+            n = numpy.arange(self.length)
+            kernel = numpy.exp(self.direction * 2j * numpy.pi * numpy.outer(var_array[~integer], n) / self.length)
+            samples = self.__once__('samples', self.__samples__)
+            ret[~integer] = kernel @ samples / (self.length if self.direction == 1 else 1)
+        return ret
+
+    def __kernel__(self, var: float or int) -> complex:
+        return complex(self.__values__(numpy.array([var], dtype=float))[0])
+
+    def evaluate(self, var_array) -> numpy.ndarray:
+        return self.__fill__(var_array, self.__values__)
 
 
 class DFT(FT):
@@ -116,16 +252,31 @@ class DTFT(PluralSignal):
     离散时间傅立叶变换
     """
 
-    def __init__(self, signal: Signal, *args, **kwargs):
+    def __init__(self, signal: Signal, *args, block: int = 4096, **kwargs):
+        """
+        :param signal: 输入离散信号
+        :param block: 每块计算的频点数，限制内存占用
+        :param kwargs: 其他基类参数
+        """
         assert signal.cycle is False and signal.signal_type is int
         self.signal = RealToPlural(signal) if isinstance(signal, RealSignal) else signal
+        self.block = block
+        kwargs.setdefault('dtype', self.signal.dtype)
         super(DTFT, self).__init__(*args, signal_type=float, **kwargs)
 
-    def __kernel__(self, var: float or int) -> (float, float):
-        ret1 = ret2 = 0
-        for n, x1, y1 in self.signal:
-            x2 = math.cos(-n * var)
-            y2 = math.sin(-n * var)
-            ret1 += x1 * x2 - y1 * y2
-            ret2 += x1 * y2 + x2 * y1
-        return ret1, ret2
+    def __samples__(self) -> (numpy.ndarray, numpy.ndarray):
+        n, x = self.signal.solve_array()
+        return n, __wide__(x)
+
+    def __values__(self, var_array: numpy.ndarray) -> numpy.ndarray:
+        n, x = self.__once__('samples', self.__samples__)
+        if len(var_array) == 0:
+            return numpy.zeros(0, dtype=complex)
+        return numpy.concatenate([numpy.exp(-1j * numpy.outer(var_array[i:i + self.block], n)) @ x
+                                  for i in range(0, len(var_array), self.block)])
+
+    def __kernel__(self, var: float or int) -> complex:
+        return complex(self.__values__(numpy.array([var], dtype=float))[0])
+
+    def evaluate(self, var_array) -> numpy.ndarray:
+        return self.__fill__(var_array, self.__values__)
@@ -0,0 +1,52 @@
+import collections
+import threading
+import time
+
+from signal.cache import Cache
+from signal.signals import RealFormulaSignal
+
+
+def test_single_flight_per_key():
+    calls = collections.Counter()
+    lock = threading.Lock()
+
+    def formula(t):
+        with lock:
+            calls[t] += 1
+        time.sleep(0.01)
+        return t * 2
+
+    signal = RealFormulaSignal(formula, 0, 9, thread_safe=True)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def read():
+        barrier.wait()
+        results.append([signal[t] for t in range(10)])
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [[t * 2 for t in range(10)]] * 8
+    assert calls == collections.Counter({t: 1 for t in range(10)})
+
+
+def test_clear_drops_in_flight_result():
+    cache = Cache(thread_safe=True)
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        time.sleep(0.1)
+        return 'stale'
+
+    thread = threading.Thread(target=lambda: cache.get('key', slow))
+    thread.start()
+    started.wait()
+    cache.clear()
+    thread.join()
+    # clear之前开始的计算结果不写入缓存
+    assert 'key' not in cache
+    assert cache.get('key', lambda: 'fresh') == 'fresh'
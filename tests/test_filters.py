@@ -0,0 +1,53 @@
+import numpy
+import pytest
+from scipy.signal import lfilter
+
+from signal.filters import FIRFilter, IIRFilter
+
+
+def __blocks__(f, x: numpy.ndarray, sizes: list) -> numpy.ndarray:
+    # 按给定长度循环分块，包含空块
+    out, i, k = [], 0, 0
+    while i < len(x):
+        size = sizes[k % len(sizes)]
+        out.append(f(x[i:i + size]))
+        i, k = i + size, k + 1
+    return numpy.concatenate(out)
+
+
+def test_fir_matches_lfilter():
+    x = numpy.random.default_rng(0).normal(size=1000)
+    for taps in [numpy.array([0.5, -0.25, 0.125]), numpy.random.default_rng(1).normal(size=200)]:
+        expected = lfilter(taps, [1], x)
+        for threshold in [64, 1000]:
+            # 抽头数低于和高于fft_threshold，分别为直接卷积和重叠保留法
+            f = FIRFilter(taps, fft_threshold=threshold)
+            assert numpy.allclose(f(x), expected)
+            f.reset()
+            assert numpy.allclose(__blocks__(f, x, [1, 0, 37, 250, 3]), expected)
+    assert len(FIRFilter([1, 2])([])) == 0
+    assert len(FIRFilter([1])([])) == 0
+
+
+def test_iir_matches_lfilter():
+    x = numpy.random.default_rng(0).normal(size=1000)
+    cases = [([1, -0.5], [1]),
+             # 分子前导零即纯延迟
+             ([1, -1.2, 0.5, 0.1], [0, 0, 0.3, 0.2]),
+             # a[0] != 1
+             ([2, -0.6, 0.1], [0.5, 1]),
+             # 高阶，包含共轭复极点
+             (numpy.poly([0.9, 0.5 + 0.5j, 0.5 - 0.5j, -0.3, 0.7j, -0.7j]), [1, 2, 3, 2, 1])]
+    for a, b in cases:
+        expected = lfilter(b, a, x)
+        f = IIRFilter(list(a), list(b))
+        assert numpy.allclose(f(x), expected)
+        f.reset()
+        assert numpy.allclose(__blocks__(f, x, [1, 0, 37, 250, 3]), expected)
+
+
+def test_reject_multichannel_block():
+    with pytest.raises(ValueError):
+        FIRFilter([1, 2])(numpy.zeros((10, 2)))
+    with pytest.raises(ValueError):
+        IIRFilter([1, -0.5], [1])(numpy.zeros((10, 2)))
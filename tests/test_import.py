@@ -0,0 +1,24 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 计算部分的冷启动导入时间上限，导入pyplot并设置字体时约为0.6秒
+IMPORT_BUDGET = 0.5
+
+SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import signal.base, signal.signals, signal.utils, signal.tools
+print(json.dumps({'seconds': time.perf_counter() - start,
+                  'matplotlib': any(name.split('.')[0] == 'matplotlib' for name in sys.modules)}))
+'''
+
+
+def test_import_without_matplotlib():
+    # 新进程中导入，避免受其他测试已导入模块的影响
+    out = subprocess.run([sys.executable, '-c', SCRIPT], cwd=ROOT, capture_output=True, text=True, check=True)
+    result = json.loads(out.stdout)
+    assert not result['matplotlib']
+    assert result['seconds'] < IMPORT_BUDGET
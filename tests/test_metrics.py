@@ -0,0 +1,65 @@
+import numpy
+from skimage.metrics import mean_squared_error, peak_signal_noise_ratio, structural_similarity
+
+from metrics import Quality, QualityStream
+
+
+def __images__(shape: tuple, count: int = 3):
+    rng = numpy.random.default_rng(0)
+    reference = rng.integers(0, 256, shape, dtype=numpy.uint8)
+    noise = rng.normal(0, 20, (count,) + shape)
+    candidates = numpy.clip(reference + noise, 0, 255).astype(numpy.uint8)
+    return reference, candidates
+
+
+def __expected__(reference: numpy.ndarray, candidates: numpy.ndarray) -> dict:
+    channel_axis = -1 if reference.ndim == 3 else None
+    return {'mse_all': [mean_squared_error(reference, c) for c in candidates],
+            'psnr_all': [peak_signal_noise_ratio(reference, c, data_range=255) for c in candidates],
+            'ssim_all': [structural_similarity(reference, c, data_range=255, channel_axis=channel_axis)
+                         for c in candidates]}
+
+
+def __check__(ret: dict, expected: dict):
+    for key, value in expected.items():
+        assert numpy.allclose(ret[key], value, rtol=1e-10, atol=1e-12), key
+
+
+def test_rgb_matches_skimage():
+    reference, candidates = __images__((30, 40, 3))
+    ret = Quality(reference).score(candidates)
+    __check__(ret, __expected__(reference, candidates))
+    for k in range(3):
+        ssim = [structural_similarity(reference[..., k], c[..., k], data_range=255) for c in candidates]
+        assert numpy.allclose(ret['ssim'][:, k], ssim)
+    # 单个候选图像与图像列表
+    __check__(Quality(reference).score(candidates[0]), __expected__(reference, candidates[:1]))
+    __check__(Quality(reference).score(list(candidates)), __expected__(reference, candidates))
+
+
+def test_gray_matches_skimage():
+    reference, candidates = __images__((30, 40))
+    expected = __expected__(reference, candidates)
+    quality = Quality(reference)
+    __check__(quality.score(candidates), expected)
+    __check__(quality.score(list(candidates)), expected)
+    __check__(quality.score(candidates[0]), __expected__(reference, candidates[:1]))
+    assert quality.score(candidates)['ssim'].shape == (3, 1)
+
+
+def test_stream_matches_batch():
+    for shape in [(30, 40, 3), (30, 40)]:
+        reference, candidates = __images__(shape)
+        expected = Quality(reference).score(candidates)
+        for rows in [1, 4, 7, 13]:
+            stream = QualityStream()
+            for i in range(0, shape[0], rows):
+                stream.update(reference[i:i + rows], candidates[:, i:i + rows])
+            ret = stream.result()
+            for key in ['mse', 'psnr', 'ssim', 'ssim_all']:
+                assert numpy.allclose(ret[key], expected[key], rtol=1e-10), (shape, rows, key)
+        # 单个候选图像
+        stream = QualityStream()
+        for i in range(0, shape[0], 8):
+            stream.update(reference[i:i + 8], candidates[0, i:i + 8])
+        assert numpy.allclose(stream.result()['ssim'], expected['ssim'][:1])
@@ -0,0 +1,49 @@
+import math
+
+import numpy
+
+from image import Filter
+from signal.signals import RealSeqSignal
+from signal.utils import DFT
+
+# float32结果相对误差上界，float64累加后只剩一次舍入，约为6e-8
+FLOAT32_BOUND = 1e-6
+
+
+def __pair__(n: int = 2000):
+    seq = [math.sin(i) + 0.5 * math.cos(0.3 * i) for i in range(n)]
+    return RealSeqSignal(seq, 0, n - 1), RealSeqSignal(seq, 0, n - 1, dtype=numpy.float32)
+
+
+def __relative__(x: numpy.ndarray, y: numpy.ndarray) -> float:
+    return numpy.abs(x - y).max() / numpy.abs(x).max()
+
+
+def test_default_dtype():
+    x, _ = __pair__(16)
+    assert x.solve_array()[1].dtype == numpy.float64
+    assert DFT(x).solve_array()[1].dtype == numpy.complex128
+
+
+def test_float32_convolution():
+    x, y = __pair__()
+    expected, actual = (x ** x).solve_array()[1], (y ** y).solve_array()[1]
+    assert actual.dtype == numpy.float32
+    assert __relative__(expected, actual) < FLOAT32_BOUND
+
+
+def test_float32_dft():
+    x, y = __pair__()
+    expected, actual = DFT(x).solve_array()[1], DFT(y).solve_array()[1]
+    assert actual.dtype == numpy.complex64
+    assert __relative__(expected, actual) < FLOAT32_BOUND
+
+
+def test_filter_uint8_matches_float():
+    img = numpy.random.default_rng(0).integers(0, 256, (24, 32, 3), dtype=numpy.uint8)
+    for name in ['mean', 'median', 'gaussian']:
+        expected = getattr(Filter(), name)(img)
+        assert numpy.array_equal(getattr(Filter(numpy.uint8), name)(img), expected)
+        # float32只可能在结果恰为整数的像素上因截断小1
+        actual = getattr(Filter(numpy.float32), name)(img)
+        assert numpy.abs(expected.astype(int) - actual).max() <= 1
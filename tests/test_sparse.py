@@ -0,0 +1,27 @@
+import numpy
+
+from signal.base import MultiRealSignal
+from signal.signals import Comb, Impulse, PiecewiseSignal, Step
+
+
+def __dense__(signal, start: int, end: int) -> numpy.ndarray:
+    return numpy.array([signal[t] for t in range(start, end + 1)], dtype=float)
+
+
+def test_sum_clips_segments_to_operand_range():
+    # 卷积结果的时间范围小于分段的范围，相加后范围外的分段不能重新出现
+    a = Comb(1, 3, period=2, strength=2) ** PiecewiseSignal([(2, 4, 1)], 2, 4)
+    b = Impulse(1, 8, switch=8, strength=0.5)
+    assert numpy.array_equal((a + b).solve_array()[1], [0, 0, 2, 2, 0, 0, 0, 0.5])
+    assert numpy.array_equal(__dense__(a + b, 0, 9), __dense__(MultiRealSignal(a, b, '+'), 0, 9))
+
+
+def test_sparse_operations_match_dense():
+    rect = Step(0, 30, 5) - Step(0, 30, 12, 2)
+    comb = Comb(0, 30, 4, 1.5)
+    for signal1, signal2, multi_type in [(comb, rect, '*'), (rect, rect, '*'), (comb, rect, '**'),
+                                         (rect, comb, '**'), (comb, comb, '**')]:
+        simplified = {'*': signal1.__mul__, '**': signal1.__pow__}[multi_type](signal2)
+        assert isinstance(simplified, PiecewiseSignal)
+        expected = __dense__(MultiRealSignal(signal1, signal2, multi_type), -5, 70)
+        assert numpy.allclose(__dense__(simplified, -5, 70), expected)
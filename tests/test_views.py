@@ -0,0 +1,33 @@
+import pytest
+
+from signal.signals import RealSeqSignal
+
+
+def __values__(signal) -> list:
+    return signal.solve_array()[1].tolist()
+
+
+def test_slice_includes_stop():
+    a = RealSeqSignal(list(range(1, 9)), 0, 7)
+    assert __values__(a[2:5]) == [3, 4, 5, 6]
+    assert __values__(a[5:20]) == [6, 7, 8]
+    assert __values__(a[::3]) == [1, 4, 7]
+
+
+def test_slice_outside_signal_is_zero():
+    a = RealSeqSignal(list(range(1, 9)), 0, 7)
+    assert __values__(a[10:20]) == [0] * 11
+    assert __values__(a[-5:-1]) == [0] * 5
+
+
+def test_slice_without_samples():
+    a = RealSeqSignal(list(range(1, 9)), 0, 7)
+    with pytest.raises(IndexError):
+        a[5:2]
+    with pytest.raises(IndexError):
+        a[2.2:2.8]
+
+
+def test_reverse_off_grid_end():
+    a = RealSeqSignal(list(range(11)), 0, 10.5)
+    assert __values__(a.reverse()) == list(range(10, -1, -1))